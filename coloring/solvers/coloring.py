@@ -1,7 +1,10 @@
+import os
 import sys
 import time
+import numpy as np
 from ortools.sat.python import cp_model
 from solvers.utils import parser_input, parser_output
+from solvers.dsatur import dsatur_coloring
 
 def greedy(input_data):
     """ Greedly select colors based on neigbhood
@@ -12,24 +15,21 @@ def greedy(input_data):
     Returns:
         output_data (str): Specific format to submit assignment to Coursera
     """
-    # Create Graph object using networkx
+    # Create Graph object in CSR format
     graph = parser_input(input_data)
     # Assign colors variables to -1, its mean not choosed color
-    colors = [-1] * graph.number_of_nodes()
-    # Fix first color for first node by 0
-    colors[0] = 0
+    colors = [-1] * graph.node_count
 
     # Order nodes by degree
-    max_degree = max(graph.degree(), key=lambda degree: degree[1])[1]
-    nodes_sorted_by_degree = [
-        node for node, _ in sorted(graph.degree(), reverse=True, key=lambda degree: degree[1])
-    ]
+    max_degree = int(graph.degree.max(initial=0))
+    nodes_sorted_by_degree = np.argsort(-graph.degree, kind='stable').tolist()
 
     # Explore all nodes by decrease order of degrees
     # and choose a diferent color of neigbhood, to minor
     for node in nodes_sorted_by_degree:
-        adj_colors = [colors[nbr] for nbr in list(graph.neighbors(node))]
-        for c in range(max_degree):
+        adj_colors = {colors[nbr] for nbr in graph.neighbors(node).tolist()}
+        # A node with max_degree neighbors always has a free color in max_degree + 1
+        for c in range(max_degree + 1):
             if not c in adj_colors:
                 colors[node] = c
                 break
@@ -61,38 +61,98 @@ class ColoringSolutionPrinter(cp_model.CpSolverSolutionCallback):
         print()
 
 
-def constraint_programming(input_data):
+def greedy_clique(graph, starts=10):
+    """ Greedly build a large clique, starting from nodes with high degree
+        and adding the candidate with more neigbhors inside candidates.
+
+    Args:
+        graph (Graph): Graph in CSR format
+        starts (int): Number of start nodes to try
+
+    Returns:
+        clique (list): Nodes of largest clique found
+    """
+    adjacency = [set(graph.neighbors(node).tolist()) for node in range(graph.node_count)]
+    best = []
+    for start in np.argsort(-graph.degree, kind='stable')[:starts].tolist():
+        clique = [start]
+        candidates = set(adjacency[start])
+        while candidates:
+            node = max(candidates, key=lambda v: len(adjacency[v] & candidates))
+            clique.append(node)
+            candidates &= adjacency[node]
+        if len(clique) > len(best):
+            best = clique
+    return best
+
+def rename_colors(colors, clique):
+    """ Rename colors to agree with clique fixed to colors 0..q-1
+
+    Args:
+        colors (list): Coloring without conflicts
+        clique (list): Nodes of a clique
+
+    Returns:
+        colors (list): Same coloring, with clique[j] colored by j
+    """
+    rename = {colors[node]: color for color, node in enumerate(clique)}
+    for color in sorted(set(colors)):
+        if color not in rename:
+            rename[color] = len(rename)
+    return [rename[color] for color in colors]
+
+def constraint_programming(input_data, time_limit=2400.0):
+    """ CP-SAT model warm started by DSatur coloring. Domains are bounded by
+        number of colors of DSatur and a large clique is fixed to colors 0..q-1.
+
+    Args:
+        input_data (str): The data of coloring instance
+        time_limit (float): Time limit in seconds. Default is 2400.
+
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
     graph = parser_input(input_data)
-    node_count = graph.number_of_nodes()
-    max_degree = max(graph.degree(), key=lambda degree: degree[1])[1]
+    node_count = graph.node_count
+
+    # Heuristic solution gives an upper bound and clique a lower bound
+    heuristic = dsatur_coloring(graph)
+    upper_bound = max(heuristic, default=-1) + 1
+    clique = greedy_clique(graph)
+
+    heuristic = rename_colors(heuristic, clique)
 
     model = cp_model.CpModel()
     # Variables
     colors = [
-        model.NewIntVar(0, max_degree, f'c{i}') for i in range(node_count)
+        model.NewIntVar(0, upper_bound - 1, f'c{i}') for i in range(node_count)
     ]
     
     # Constraints
-    for i, j in graph.edges:
+    for i, j in graph.edges.tolist():
         model.Add(colors[i] != colors[j])
     
     # Break Symmetry
-    # WEAK
+    # Nodes of clique have distinct colors, so fix them
+    for color, node in enumerate(clique):
+        model.Add(colors[node] == color)
+
+    # Warm start
     for i in range(node_count):
-        model.Add(colors[i] <= i + 1)
+        model.AddHint(colors[i], heuristic[i])
 
     # Objective Function
-    max_colors = model.NewIntVar(0, max_degree, 'number of colors')
+    max_colors = model.NewIntVar(len(clique) - 1, upper_bound - 1, 'number of colors')
     model.AddMaxEquality(max_colors, colors)
     model.Minimize(max_colors)
     # model.AddDecisionStrategy(colors, cp_model.CHOOSE_FIRST, cp_model.SELECT_MIN_VALUE)
 
     solver = cp_model.CpSolver()
     solution_printer = ColoringSolutionPrinter(colors)
-    solver.parameters.max_time_in_seconds = 2400.0
+    solver.parameters.max_time_in_seconds = time_limit
     # solver.parameters.enumerate_all_solutions = True
 
-    solver.Solve(model, solution_printer)
+    status = solver.Solve(model, solution_printer)
     # solver.Solve(model)
 
     # Statistics.
@@ -104,13 +164,211 @@ def constraint_programming(input_data):
     print(f'  solutions found: {solution_printer.solution_count()}')
     print()
 
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        # No solution in time limit, the heuristic is feasible
+        return parser_output(upper_bound, heuristic, 0)
+
     output_data = parser_output(
         int(solver.ObjectiveValue() + 1) , 
         (str(solver.Value(colors[i])) for i in range(node_count)), 
-        '0'
+        int(status == cp_model.OPTIMAL)
     )
     return output_data
 
+def edge_clique_cover(graph, deadline=None):
+    """ Greedly cover the edges by cliques. Each clique grows from an uncovered edge
+        adding the common neigbhor with more uncovered edges to clique,
+        so one at most one constraint by clique replaces one constraint by edge.
+
+    Args:
+        graph (Graph): Graph in CSR format
+        deadline (float): Time (time.time()) to give up. Default is None (no limit)
+
+    Returns:
+        cliques (list): List of cliques (list of nodes) or None if deadline passed
+    """
+    adjacency = [set(graph.neighbors(node).tolist()) for node in range(graph.node_count)]
+    # uncovered[v] is set of neigbhors of v with edge not covered yet
+    uncovered = [set(nbrs) for nbrs in adjacency]
+    cliques = []
+    for u in range(graph.node_count):
+        while uncovered[u]:
+            if deadline is not None and time.time() > deadline:
+                return None
+            v = min(uncovered[u])
+            clique = [u, v]
+            candidates = adjacency[u] & adjacency[v]
+            # fresh[w] is number of uncovered edges from w to clique
+            fresh = {w: (w in uncovered[u]) + (w in uncovered[v]) for w in candidates}
+            while candidates:
+                w = max(candidates, key=fresh.__getitem__)
+                if fresh[w] == 0:
+                    break
+                clique.append(w)
+                candidates &= adjacency[w]
+                for z in candidates & uncovered[w]:
+                    fresh[z] += 1
+            for i, a in enumerate(clique):
+                for b in clique[i + 1:]:
+                    uncovered[a].discard(b)
+                    uncovered[b].discard(a)
+            cliques.append(clique)
+    return cliques
+
+class ColoringModel:
+    """ k-colorability CP-SAT model with boolean x[v, c] assignment variables,
+        built once with max_colors colors and reused decreasing k.
+        Adjacent nodes are kept with different colors by one at most one
+        constraint by clique of an edge clique cover and color.
+        Colors are used in order (used[c] implies used[c - 1]) and
+        clique is fixed to colors 0..q-1.
+
+    Args:
+        graph (Graph): Graph in CSR format
+        max_colors (int): Number of colors of model
+        clique (list): Nodes of a clique, len(clique) <= max_colors
+    """
+    def __init__(self, graph, max_colors, clique):
+        self.graph = graph
+        self.max_colors = max_colors
+        self.clique = clique
+        # Colors max_colors - 1 down to color_count are forbidden
+        self.color_count = max_colors
+        self.model = None
+
+    def build(self, deadline):
+        """ Build the model, giving up if deadline passed
+
+        Args:
+            deadline (float): Time (time.time()) to give up
+
+        Returns:
+            built (bool): True if model was built before deadline
+        """
+        start = time.time()
+        node_count = self.graph.node_count
+        k = self.max_colors
+        cliques = edge_clique_cover(self.graph, deadline)
+        if cliques is None:
+            return False
+
+        model = cp_model.CpModel()
+        # Variables
+        x = [[model.NewBoolVar(f'x{v}_{c}') for c in range(k)] for v in range(node_count)]
+        used = [model.NewBoolVar(f'used{c}') for c in range(k)]
+
+        # Constraints
+        # Each node has exactly one color
+        for v in range(node_count):
+            model.AddExactlyOne(x[v])
+        # Nodes of a clique have different colors
+        for i, clique in enumerate(cliques):
+            if i % 1000 == 0 and time.time() > deadline:
+                return False
+            for c in range(k):
+                model.AddAtMostOne([x[v][c] for v in clique])
+        # Color is used if and only if some node has it
+        for c in range(k):
+            model.AddMaxEquality(used[c], [x[v][c] for v in range(node_count)])
+
+        # Break Symmetry
+        for c in range(1, k):
+            model.AddImplication(used[c], used[c - 1])
+        for color, node in enumerate(self.clique):
+            model.Add(x[node][color] == 1)
+
+        self.model, self.x, self.used = model, x, used
+        # CP-SAT takes about same time to load the model, even after time limit
+        self.build_time = time.time() - start
+        return time.time() <= deadline
+
+    def solve(self, k, hint, time_limit, num_search_workers):
+        """ Solve k-colorability problem, forbidding colors k..max_colors-1
+
+        Args:
+            k (int): Number of colors, k <= max_colors and k can only decrease
+            hint (list): Color of each node to hint solver, -1 to not hint
+            time_limit (float): Time limit in seconds
+            num_search_workers (int): Number of CP-SAT workers
+
+        Returns:
+            status (int): CP-SAT status
+            colors (list): Coloring without conflicts or None if not found
+        """
+        model, x, used = self.model, self.x, self.used
+        # Colors are used in order, so forbid only first removed colors is enough,
+        # but fix all to help presolve
+        for c in range(k, self.color_count):
+            model.Add(used[c] == 0)
+        self.color_count = min(self.color_count, k)
+
+        # Warm start
+        model.ClearHints()
+        for v, color in enumerate(hint):
+            if color != -1 and color < k:
+                model.AddHint(x[v][color], 1)
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_search_workers = num_search_workers
+        status = solver.Solve(model)
+        print(f'k = {k}: {solver.StatusName(status)}, wall time = {solver.WallTime()} s')
+
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return status, None
+        colors = [
+            next(c for c in range(k) if solver.BooleanValue(x[v][c]))
+            for v in range(self.graph.node_count)
+        ]
+        return status, colors
+
+def decreasing_k(input_data, time_limit=600.0, num_search_workers=None):
+    """ Start with DSatur coloring and solve a sequence of k-colorability problems
+        in the same model, decreasing k after each success and hinting previous solution.
+        If k-1 is proved infeasible, the coloring with k colors is optimal.
+
+    Args:
+        input_data (str): The data of coloring instance
+        time_limit (float): Time limit in seconds. Default is 600.
+        num_search_workers (int): Number of CP-SAT workers. Default is None (all cores).
+
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
+    deadline = time.time() + time_limit
+    num_search_workers = num_search_workers or os.cpu_count() or 1
+    graph = parser_input(input_data)
+
+    clique = greedy_clique(graph)
+    best = rename_colors(dsatur_coloring(graph), clique)
+    k = max(best, default=-1) + 1
+    # Clique size is a lower bound
+    optimal = k <= len(clique)
+
+    model = ColoringModel(graph, k - 1, clique)
+    if not optimal and not model.build(deadline):
+        # No time to build the model, keep heuristic
+        print(f'model not built in time limit, k = {k}')
+        return parser_output(k, best, 0)
+
+    while not optimal:
+        # Reserve time to CP-SAT load the model
+        remaining = deadline - time.time() - model.build_time
+        if remaining <= 0:
+            break
+        # Nodes of removed color are not hinted
+        hint = [color if color < k - 1 else -1 for color in best]
+        status, colors = model.solve(k - 1, hint, remaining, num_search_workers)
+        if colors is None:
+            optimal = status == cp_model.INFEASIBLE
+            break
+        best = colors
+        k = max(best) + 1
+        optimal = k <= len(clique)
+
+    output_data = parser_output(k, best, int(optimal))
+    return output_data
+
 if __name__ == '__main__':
     if len(sys.argv) > 1:
         file_location = sys.argv[1].strip()
@@ -0,0 +1,69 @@
+import heapq
+from solvers.utils import parser_input, parser_output
+
+def dsatur_coloring(graph):
+    """ DSatur: color first the node with most distinct colors in neigbhood (saturation),
+        breaking ties by degree. Each saturation level has your own bucket (heap by degree),
+        stale entries are skipped when popped, so total cost is O((n + m) log n).
+
+    Args:
+        graph (Graph): Graph in CSR format
+
+    Returns:
+        colors (list): Color of each node, colors are 0..k-1
+    """
+    node_count = graph.node_count
+    degree = graph.degree.tolist()
+    indptr = graph.indptr.tolist()
+    indices = graph.indices.tolist()
+
+    colors = [-1] * node_count
+    # Colors already used by neigbhood of each node, updated when a neigbhor is colored
+    forbidden = [set() for _ in range(node_count)]
+    # buckets[s] is a heap of (-degree, node) with nodes that have saturation s
+    buckets = [[(-degree[node], node) for node in range(node_count)]]
+    heapq.heapify(buckets[0])
+    saturation = 0
+
+    for _ in range(node_count):
+        # Find the uncolored node with max saturation, skipping stale entries
+        while True:
+            while not buckets[saturation]:
+                saturation -= 1
+            _, node = heapq.heappop(buckets[saturation])
+            if colors[node] == -1 and len(forbidden[node]) == saturation:
+                break
+
+        # Smallest color not used by neigbhood
+        color = 0
+        while color in forbidden[node]:
+            color += 1
+        colors[node] = color
+
+        # Update saturation of uncolored neigbhood
+        for nbr in indices[indptr[node]:indptr[node + 1]]:
+            if colors[nbr] != -1 or color in forbidden[nbr]:
+                continue
+            forbidden[nbr].add(color)
+            level = len(forbidden[nbr])
+            if level == len(buckets):
+                buckets.append([])
+            heapq.heappush(buckets[level], (-degree[nbr], nbr))
+            saturation = max(saturation, level)
+
+    return colors
+
+def dsatur(input_data):
+    """ DSatur heuristic for graph coloring
+
+    Args:
+        input_data (str): The data of coloring instance
+
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
+    graph = parser_input(input_data)
+    colors = dsatur_coloring(graph)
+
+    output_data = parser_output(max(colors, default=-1) + 1, colors, 0)
+    return output_data
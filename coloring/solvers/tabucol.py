@@ -0,0 +1,148 @@
+import time
+import numpy as np
+from solvers.utils import parser_input, parser_output
+from solvers.dsatur import dsatur_coloring
+from solvers.coloring import greedy_clique
+
+def conflict_matrix(graph, colors, k):
+    """ Build gamma matrix, gamma[v, c] is number of neigbhors of v with color c
+
+    Args:
+        graph (Graph): Graph in CSR format
+        colors (np.ndarray): Color of each node, colors are 0..k-1
+        k (int): Number of colors
+
+    Returns:
+        gamma (np.ndarray): Matrix (node_count x k) of conflicts
+    """
+    gamma = np.zeros((graph.node_count, k), dtype=np.int64)
+    sources = np.repeat(np.arange(graph.node_count), graph.degree)
+    np.add.at(gamma, (sources, colors[graph.indices]), 1)
+    return gamma
+
+def tabucol(graph, colors, k, deadline, max_iterations=None, tenure=10, alpha=0.6, rng=None):
+    """ Tabucol: find a k-coloring moving one conflicting node to another color by iteration.
+        Moves are evaluated in O(1) by gamma matrix and updated in O(deg),
+        conflicting nodes are kept in a set updated only for moved node and neigbhood.
+        After a move of node v from color c, (v, c) is tabu for
+        tenure random(0..tenure-1) + alpha * number of conflicting nodes iterations.
+
+    Args:
+        graph (Graph): Graph in CSR format
+        colors (np.ndarray): Initial coloring, colors are 0..k-1 (may have conflicts)
+        k (int): Number of colors
+        deadline (float): Time (time.time()) to stop the search
+        max_iterations (int): Max iterations without improve. Default is None (no limit)
+        tenure (int): Range of random part of tabu tenure
+        alpha (float): Weight of conflicting nodes in tabu tenure
+        rng (np.random.Generator): Random generator
+
+    Returns:
+        colors (np.ndarray): Coloring without conflicts or None if not found
+    """
+    rng = rng or np.random.default_rng()
+    colors = colors.copy()
+    node_range = np.arange(graph.node_count)
+    gamma = conflict_matrix(graph, colors, k)
+    tabu = np.zeros((graph.node_count, k), dtype=np.int64)
+    # Each conflicting edge is counted twice
+    conflicts = int(gamma[node_range, colors].sum()) // 2
+    # Set of conflicting nodes, members[:size] are the nodes and
+    # position[v] is index of v in members or -1 if v has no conflict
+    members = np.flatnonzero(gamma[node_range, colors] > 0)
+    size = len(members)
+    members = np.concatenate([members, np.zeros(graph.node_count - size, dtype=members.dtype)])
+    position = np.full(graph.node_count, -1, dtype=np.int64)
+    position[members[:size]] = np.arange(size)
+    best_conflicts = conflicts
+    iteration = 0
+    last_improve = 0
+
+    while conflicts > 0:
+        if time.time() > deadline:
+            return None
+        if max_iterations is not None and iteration - last_improve > max_iterations:
+            return None
+        iteration += 1
+
+        # Evaluate all moves of conflicting nodes
+        conflicting = members[:size]
+        current = gamma[conflicting, colors[conflicting]]
+        delta = gamma[conflicting] - current[:, None]
+        delta[np.arange(len(conflicting)), colors[conflicting]] = graph.node_count
+        # Tabu moves are allowed only if improve the best solution (aspiration)
+        forbidden = (tabu[conflicting] > iteration) & (conflicts + delta >= best_conflicts)
+        delta[forbidden] = graph.node_count
+        best_delta = delta.min()
+        if best_delta >= graph.node_count:
+            # All moves are tabu, wait tabu expire
+            continue
+        rows, cols = np.nonzero(delta == best_delta)
+        choice = rng.integers(len(rows))
+        node, color = int(conflicting[rows[choice]]), int(cols[choice])
+        tenure_length = rng.integers(tenure) + int(alpha * size)
+
+        # Move node and update gamma of neigbhood
+        old_color = colors[node]
+        colors[node] = color
+        nbrs = graph.neighbors(node)
+        gamma[nbrs, old_color] -= 1
+        gamma[nbrs, color] += 1
+        conflicts += int(best_delta)
+        tabu[node, old_color] = iteration + tenure_length
+
+        # Only node and neigbhors with old or new color can change conflict status
+        affected = nbrs[(colors[nbrs] == old_color) | (colors[nbrs] == color)].tolist()
+        for v in [node] + affected:
+            has_conflict = gamma[v, colors[v]] > 0
+            if has_conflict and position[v] == -1:
+                position[v] = size
+                members[size] = v
+                size += 1
+            elif not has_conflict and position[v] != -1:
+                # Swap with last member and remove
+                last = members[size - 1]
+                members[position[v]] = last
+                position[last] = position[v]
+                position[v] = -1
+                size -= 1
+
+        if conflicts < best_conflicts:
+            best_conflicts = conflicts
+            last_improve = iteration
+
+    return colors
+
+def tabu_search(input_data, time_limit=60, seed=None):
+    """ Start with DSatur coloring and decrease k while Tabucol find a k-coloring.
+        Colors of removed color k-1 are moved to random colors.
+        Stop when k reach size of a clique, lower bound of colors.
+
+    Args:
+        input_data (str): The data of coloring instance
+        time_limit (float): Time limit in seconds
+        seed (int): Seed of random generator
+
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
+    deadline = time.time() + time_limit
+    rng = np.random.default_rng(seed)
+    graph = parser_input(input_data)
+    best = np.array(dsatur_coloring(graph), dtype=np.int64)
+    k = int(best.max(initial=-1)) + 1
+    lower_bound = len(greedy_clique(graph))
+
+    while k > lower_bound:
+        # Remove last color
+        colors = best.copy()
+        removed = colors == k - 1
+        colors[removed] = rng.integers(k - 1, size=int(removed.sum()))
+        colors = tabucol(graph, colors, k - 1, deadline, rng=rng)
+        if colors is None:
+            break
+        best = colors
+        k -= 1
+
+    output_data = parser_output(k, best.tolist(), int(k <= lower_bound))
+    return output_data
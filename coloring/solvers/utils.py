@@ -1,4 +1,49 @@
-import networkx as nx
+import numpy as np
+
+class Graph:
+    """Compressed sparse row (CSR) adjacency of an undirected graph.
+        The neighbors of node v are indices[indptr[v]:indptr[v + 1]].
+
+    Args:
+        node_count (int): Number of nodes, isolated nodes included
+        edges (np.ndarray): Array of shape (edge_count x 2) with the edges
+    """
+    def __init__(self, node_count, edges):
+        self.node_count = node_count
+        self.edges = edges
+        # Each edge is stored in both directions
+        sources = np.concatenate([edges[:, 0], edges[:, 1]])
+        targets = np.concatenate([edges[:, 1], edges[:, 0]])
+        self.degree = np.bincount(sources, minlength=node_count)
+        self.indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(self.degree, out=self.indptr[1:])
+        self.indices = targets[np.argsort(sources, kind='stable')]
+
+    def number_of_nodes(self) -> int:
+        return self.node_count
+
+    def neighbors(self, node) -> np.ndarray:
+        """ Neighbors of a node.
+
+        Args:
+            node (int): Node of graph
+
+        Returns:
+            Array with the neighbors of node
+        """
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def to_networkx(self):
+        """ Convert to a NetworkX graph, NetworkX is imported only here.
+
+        Returns:
+            graph (nx.Graph): Graph with all nodes, isolated nodes included
+        """
+        import networkx as nx
+        graph = nx.Graph()
+        graph.add_nodes_from(range(self.node_count))
+        graph.add_edges_from(self.edges.tolist())
+        return graph
 
 def parser_input(input_data):
     """Parser a str input to correct type to work
@@ -7,24 +52,18 @@ def parser_input(input_data):
         input_data (str): The data of graph coloring instance
     
     Returns:
-        graph (nextworx) : Graph
+        graph (Graph) : Graph in CSR format
     """
     # node_count (int): Number of nodes
     # edge_count (int): Number of edges
-    # edges (List(Tuple(int, int))): List of edges
+    # edges (np.ndarray): Array of edges
     # parse the input
-    lines = input_data.split('\n')
-
-    first_line = lines[0].split()
-    node_count = int(first_line[0])
-    edge_count = int(first_line[1])
-    edges = []
-    for i in range(1, edge_count + 1):
-        line = lines[i]
-        parts = line.split()
-        edges.append((int(parts[0]), int(parts[1])))
-    
-    graph = nx.Graph(edges)
+    tokens = input_data.split()
+    node_count = int(tokens[0])
+    edge_count = int(tokens[1])
+    edges = np.array(tokens[2:2 + 2 * edge_count], dtype=np.int64).reshape(edge_count, 2)
+
+    graph = Graph(node_count, edges)
     
     return graph
 
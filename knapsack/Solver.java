@@ -13,12 +13,46 @@ public class Solver {
      */
     public static void main(String[] args) {
         try {
+            for(String arg : args){
+                if(arg.equals("-worker")){
+                    serve();
+                    return;
+                }
+            }
             solve(args);
         } catch (IOException e) {
             e.printStackTrace();
         }
     }
     
+    /**
+     * Run as a long-lived worker, reading instances from the standard input and writing
+     * the solutions in the standard output until the input is closed.
+     * Each message, in both directions, is a line with the number of lines that follow
+     * and then the lines themselves.
+     */
+    public static void serve() throws IOException {
+        BufferedReader input = new BufferedReader(new InputStreamReader(System.in));
+        PrintStream output = new PrintStream(new BufferedOutputStream(System.out), false);
+        String header = null;
+        while ((header = input.readLine()) != null) {
+            if(header.trim().isEmpty())
+                continue;
+            int count = Integer.parseInt(header.trim());
+            List<String> lines = new ArrayList<String>();
+            for(int i=0; i < count; i++){
+                lines.add(input.readLine());
+            }
+            
+            String[] solution = solve(lines).split("\n");
+            output.println(solution.length);
+            for(String line : solution){
+                output.println(line);
+            }
+            output.flush();
+        }
+    }
+    
     /**
      * Read the instance, solve it, and print the solution in the standard output
      */
@@ -48,7 +82,13 @@ public class Solver {
             input.close();
         }
         
-        
+        System.out.println(solve(lines));
+    }
+    
+    /**
+     * Solve the instance given by its lines and return the solution in the specified output format
+     */
+    public static String solve(List<String> lines) {
         // parse the data in the file
         String[] firstLine = lines.get(0).split("\\s+");
         int items = Integer.parseInt(firstLine[0]);
@@ -82,10 +122,11 @@ public class Solver {
         }
         
         // prepare the solution in the specified output format
-        System.out.println(value+" 0");
+        StringBuilder solution = new StringBuilder();
+        solution.append(value+" 0\n");
         for(int i=0; i < items; i++){
-            System.out.print(taken[i]+" ");
+            solution.append(taken[i]+" ");
         }
-        System.out.println("");        
+        return solution.toString();
     }
 }
\ No newline at end of file
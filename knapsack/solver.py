@@ -1,59 +1,68 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import logging
 from collections import namedtuple
-from solvers.greedy import priority_density, priority_value, priority_weight
-from solvers.dynamic_programming import dynamic_programming
+from solvers.dynamic_programming import dynamic_programming, hirschberg
 from solvers.branch_and_bound import BranchAndBound
+from solvers.core import core_problem
+from solvers.pareto_frontier import pareto_frontier
+from solvers.cp_sat import constraint_programming
+from solvers.local_search import greedy_local_search
+from solvers.selector import select_algorithm
 Item = namedtuple("Item", ['index', 'value', 'weight'])
 
-def greedy(input_data):
-    greedy_density = priority_density(input_data)
-    greedy_value = priority_value(input_data)
-    greedy_weight = priority_weight(input_data)
-    
-    density_objective = float(greedy_density.split()[0])
-    value_objective = float(greedy_value.split()[0])
-    weight_objective = float(greedy_weight.split()[0])
-
-    best_greedy = ''
-    best_greedy_value = 0
-
-    if density_objective > best_greedy_value:
-        best_greedy_value = density_objective
-        best_greedy = greedy_density
-    if value_objective > best_greedy_value:
-        best_greedy_value = value_objective
-        best_greedy = greedy_value
-    if weight_objective > best_greedy_value:
-        best_greedy_value = weight_objective
-        best_greedy = greedy_weight
-
-    return best_greedy
+logger = logging.getLogger(__name__)
+# Time limit in seconds of anytime algorithms
+TIME_LIMIT = 60
 
 def dp(input_data):
     dp = dynamic_programming(input_data)
     return dp
 
+def linear_dp(input_data):
+    dp = hirschberg(input_data)
+    return dp
+
+def core(input_data):
+    core = core_problem(input_data)
+    return core
+
+def pareto(input_data):
+    pareto = pareto_frontier(input_data, time_limit=TIME_LIMIT)
+    return pareto
+
+def cp_sat(input_data):
+    cp_sat = constraint_programming(input_data, TIME_LIMIT)
+    return cp_sat
+
 def bnb(input_data):
     bnb = BranchAndBound(input_data)
-    return bnb.DFS()
+    return bnb.anytime(TIME_LIMIT)
 
+def heuristic(input_data):
+    heuristic = greedy_local_search(input_data, TIME_LIMIT)
+    return heuristic
 
-def solve_it(input_data):
-    # Modify this code to run your optimization algorithm
+SOLVERS = {
+    'dp': dp,
+    'linear_dp': linear_dp,
+    'core': core,
+    'pareto': pareto,
+    'cp_sat': cp_sat,
+    'bnb': bnb,
+    'heuristic': heuristic,
+}
 
-    match int(input_data.split()[0]):
-        case 200:
-            return dp(input_data)
-        case 10000:
-            return greedy(input_data)
-        case _:
-            return bnb(input_data)
+def solve_it(input_data):
+    algorithm, reason = select_algorithm(input_data)
+    logger.info('Selected %s: %s', algorithm, reason)
+    return SOLVERS[algorithm](input_data)
 
 
 if __name__ == '__main__':
     import sys
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     if len(sys.argv) > 1:
         file_location = sys.argv[1].strip()
         with open(file_location, 'r') as input_data_file:
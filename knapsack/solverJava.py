@@ -1,27 +1,149 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import atexit
 import os
+from queue import Empty, Queue
 from subprocess import Popen, PIPE
+from threading import Lock
 
-def solve_it(input_data):
+class JavaWorker:
+    """Long-lived 'java Solver -worker' process, the instances are sent through pipes.
+        Each message, in both directions, is a line with the number of lines that follow
+        and then the lines themselves.
+    """
+    def __init__(self):
+        self.process = Popen(
+            ['java', 'Solver', '-worker'],
+            stdin=PIPE, stdout=PIPE, universal_newlines=True, bufsize=1
+        )
+
+    def solve(self, input_data):
+        """ Send an instance to worker and wait its solution.
+
+        Args:
+            input_data (str): The data of knapsack instance
+
+        Returns:
+            output_data (str): Solution written by Java Solver
+        """
+        lines = input_data.strip().split('\n')
+        self.process.stdin.write(f'{len(lines)}\n' + '\n'.join(lines) + '\n')
+        self.process.stdin.flush()
+
+        header = self.process.stdout.readline()
+        if not header:
+            raise RuntimeError(f'Java worker exited with code {self.process.wait()}')
+        solution = [self.process.stdout.readline() for _ in range(int(header))]
+        return ''.join(solution).strip()
+
+    def close(self):
+        """ Close the input of worker, so it exits, and wait it. """
+        try:
+            self.process.stdin.close()
+        except OSError:
+            # Worker already exited
+            pass
+        self.process.wait()
+
+    def kill(self):
+        """ Kill the worker, used when it failed and its pipes are in an unknown state. """
+        self.process.kill()
+        self.process.wait()
 
-    # Writes the inputData to a temporay file
+class JavaWorkerPool:
+    """Pool of Java workers, each instance is solved by a free worker.
+        The workers are started on demand, up to 'size', and reused by next instances.
+        A worker that fails is killed and its slot is put back as None in the queue
+        of free workers, so the next caller starts a new worker in its place.
+        Safe to use from many threads, for example with a ThreadPoolExecutor.
 
-    tmp_file_name = 'tmp.data'
-    tmp_file = open(tmp_file_name, 'w')
-    tmp_file.write(input_data)
-    tmp_file.close()
+    Args:
+        size (int): Maximum number of workers
+    """
+    def __init__(self, size=None):
+        self.size = size or os.cpu_count() or 1
+        self.workers = []
+        # Free workers, None is a free slot without worker
+        self.free_workers = Queue()
+        # Number of slots in use, workers alive or slots waiting a new worker
+        self.slots = 0
+        self.lock = Lock()
 
-    # Runs the command: java Solver -file=tmp.data
+    def acquire(self):
+        """ Get a free worker, starting a new one if all are busy and the pool is not full.
 
-    process = Popen(['java', 'Solver', '-file=' + tmp_file_name], stdout=PIPE, universal_newlines=True)
-    (stdout, stderr) = process.communicate()
+        Returns:
+            worker (JavaWorker): Worker reserved to caller
+        """
+        try:
+            worker = self.free_workers.get_nowait()
+        except Empty:
+            with self.lock:
+                has_slot = self.slots < self.size
+                if has_slot:
+                    self.slots += 1
+            worker = None if has_slot else self.free_workers.get()
+        if worker is None:
+            try:
+                worker = JavaWorker()
+            except Exception:
+                with self.lock:
+                    self.slots -= 1
+                raise
+            with self.lock:
+                self.workers.append(worker)
+        return worker
 
-    # removes the temporay file
-    os.remove(tmp_file_name)
+    def discard(self, worker):
+        """ Kill a failed worker and free its slot.
 
-    return stdout.strip()
+        Args:
+            worker (JavaWorker): Worker reserved to caller
+        """
+        worker.kill()
+        with self.lock:
+            self.workers.remove(worker)
+        self.free_workers.put(None)
+
+    def solve(self, input_data):
+        """ Solve an instance with a free worker, waiting if all are busy.
+            If the worker fails, it is discarded and the error is raised.
+
+        Args:
+            input_data (str): The data of knapsack instance
+
+        Returns:
+            output_data (str): Solution written by Java Solver
+        """
+        worker = self.acquire()
+        try:
+            output_data = worker.solve(input_data)
+        except Exception:
+            self.discard(worker)
+            raise
+        self.free_workers.put(worker)
+        return output_data
+
+    def close(self):
+        """ Close all workers. """
+        with self.lock:
+            workers = list(self.workers)
+        for worker in workers:
+            worker.close()
+
+# Pool shared by solve_it calls, created on first use
+_pool = None
+_pool_lock = Lock()
+
+def solve_it(input_data):
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = JavaWorkerPool()
+                atexit.register(_pool.close)
+    return _pool.solve(input_data)
 
 
 import sys
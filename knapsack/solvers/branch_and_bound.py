@@ -1,13 +1,82 @@
+import json
+import os
+import time
+import numpy as np
+from bisect import bisect_right
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush
+from itertools import accumulate, count
+from math import ceil, floor, log2
+from multiprocessing import Value
 from operator import attrgetter
-from scipy.optimize import linprog
+from solvers.reduction import compress_items, expand_taken
 from solvers.utils import parser_input, parser_output
 
-State = namedtuple('Knapsack', ['taken', 'value', 'room', 'estimate', 'depth'])
-# taken: items taken
+State = namedtuple('State', ['taken', 'value', 'room', 'estimate', 'depth'])
+# taken: bitset of items taken, bit d is the item at depth d of branch order
 # value: sum of value of items taken
 # room: remain space in knapsack
 # estimate: optimistic estimate of value
+# depth: number of items decided, in branch order
+
+class SearchStats:
+    """Counters of a Branch and Bound search, to see where the time goes."""
+    def __init__(self):
+        self.start_time = time.time()
+        self.nodes_created = 0
+        self.nodes_expanded = 0
+        # Prunes by reason, leaf is a complete solution that ends the branch
+        self.pruned_infeasible = 0
+        self.pruned_bound = 0
+        self.pruned_leaf = 0
+        # Time in seconds spent on eval_estimate
+        self.bound_time = 0.0
+        self.max_stack_depth = 0
+        # Pairs (seconds since start, value) of each improved solution
+        self.improvements = []
+
+    def as_dict(self) -> dict:
+        ''' Counters as a dict, ready to be serialized as JSON.
+        
+        Returns:
+            Dict with the counters and the elapsed time of search.
+        '''
+        return {
+            'elapsed_time': time.time() - self.start_time,
+            'nodes_created': self.nodes_created,
+            'nodes_expanded': self.nodes_expanded,
+            'pruned_infeasible': self.pruned_infeasible,
+            'pruned_bound': self.pruned_bound,
+            'pruned_leaf': self.pruned_leaf,
+            'bound_time': self.bound_time,
+            'max_stack_depth': self.max_stack_depth,
+            'improvements': self.improvements,
+        }
+
+    def merge(self, stats):
+        ''' Add the counters of other search, like the search of a worker process.
+        
+        Args:
+            stats (dict): Counters of other search, as returned by 'as_dict'.
+        '''
+        self.nodes_created += stats['nodes_created']
+        self.nodes_expanded += stats['nodes_expanded']
+        self.pruned_infeasible += stats['pruned_infeasible']
+        self.pruned_bound += stats['pruned_bound']
+        self.pruned_leaf += stats['pruned_leaf']
+        self.bound_time += stats['bound_time']
+        self.max_stack_depth = max(self.max_stack_depth, stats['max_stack_depth'])
+
+    def dump(self, file_name, **fields):
+        ''' Append the counters as a JSON line to a file.
+        
+        Args:
+            file_name (str): Path of JSON lines file.
+            fields: Extra fields of the line, like the instance name.
+        '''
+        with open(file_name, 'a') as stats_file:
+            stats_file.write(json.dumps({**fields, **self.as_dict()}) + '\n')
 
 class BranchAndBound:
     """Branch and Bound algorithm for knapsack 0/1 problem.
@@ -17,67 +86,69 @@ class BranchAndBound:
     """
     def __init__(self, input_data):
         # Knapsack instante
-        self.item_count, self.capacity, self.items = parser_input(input_data)
-        # Linear Programming data
-        self.c = [-1 * item.value for item in self.items]
-        self.A_ub = [[item.weight for item in self.items]]
-        self.b_ub = [self.capacity]
+        self.item_count, self.capacity, items = parser_input(input_data)
+        # Identical items are merged and dominated ones limited, the tree branches on pieces
+        self.items, self.members = compress_items(self.capacity, items)
+        self.piece_count = len(self.items)
+        # Order of variables to branch, more density items first
+        self.order_to_branch = [
+            item.index for item in sorted(self.items, key=attrgetter('density'), reverse=True)
+        ]
+        # Prefix sums of weight and value in branch order, for the fractional bound
+        self.prefix_weight = [0, *accumulate(self.items[index].weight for index in self.order_to_branch)]
+        self.prefix_value = [0, *accumulate(self.items[index].value for index in self.order_to_branch)]
+        # Same data in NumPy arrays, for the batched bound, the last density is a sentinel
+        self.prefix_weight_array = np.array(self.prefix_weight, dtype=np.int64)
+        self.prefix_value_array = np.array(self.prefix_value, dtype=np.int64)
+        self.density_array = np.array(
+            [self.items[index].density for index in self.order_to_branch] + [0.0]
+        )
         # Upper bound
-        self.best_estimate = self.eval_estimate([-1] * self.item_count)
+        self.best_estimate = self.eval_estimate(0, self.capacity, 0)
         # Lower Bound
         self.best_state = State(
-            taken=[-1] * self.item_count,
+            taken=0,
             value=0,
             room=self.capacity,
             estimate=self.best_estimate,
             depth=0
         )
+        self.root = self.best_state
+        # Best value shared between processes, None if the search is not parallel
+        self.shared_best = None
+        self.stats = SearchStats()
+        # Anytime search, the dive stops at deadline and the open nodes are kept
+        self.deadline = None
+        self.on_improvement = None
+        self.open_states = []
+        self.closed = False
     
-    def eval_value(self, taken) -> int:
-        """ Evaluate the objective function of state given a taken list, named by value.
+    def eval_estimate(self, value, room, depth) -> float:
+        """ Evaluate a optmistic estimate of value of a state, this estimate is the
+                linear programming relaxation of problem, solved by the greedy fractional
+                fill (Dantzig bound) of the items not decided yet.
+                Note: The items decided are the first 'depth' items of branch order,
+                so the free items are a suffix of the density order and the fill
+                is a binary search on the prefix sums.
         
         Args:
-            taken (list): List of variables of len of knapsack with values 0, 1 or -1, 
-                where in any index 0 if item is a not took, 1 if is took and -1 if is not decided.
-        
-        Retuns:
-            Value of state, internal product with replacement of -1 to 0,
-                in knapsack problem is objective function.
-        """
-        return sum(
-            item.value * took if took != -1 else 0 
-            for item, took in zip(self.items, taken)
-        )
-    
-    def eval_room(self, taken) -> int:
-        """ Evaluate remain weigth in knapsack given a taken list, named by room.
-
-        Args:
-            taken (list): List of variables of len of knapsack with values 0, 1 or -1, 
-                where in any index 0 if item is a not took, 1 if is took and -1 if is not decided.
-            
-        Returns:
-            Remain weigth in knapsack.
-        """
-        return self.capacity - sum(
-            item.weight * took if took != -1 else 0
-            for item, took in zip(self.items, taken) 
-        )
-    
-    def eval_estimate(self, taken) -> float:
-        """ Evaluate a optmistic estimate of value given a taken list,
-                this estimate is a relaxation of problem based on linear programming.
-        
-        Args:
-            taken (list): List of variables of len of knapsack with values 0, 1 or -1, 
-                where in any index 0 if item is a not took, 1 if is took and -1 if is not decided.
+            value (int): Value of items taken.
+            room (int): Remain weigth in knapsack.
+            depth (int): Number of items decided, in branch order.
         
         Returns:
             Optimistic estimate of value, based of linear programming.
         """
-        bounds = [(0, 1) if bound == -1 else (bound, bound) for bound in taken]
-        result = linprog(self.c, A_ub=self.A_ub, b_ub=self.b_ub, bounds=bounds)
-        return 0 if result['fun'] == None else result['fun'] * -1
+        if room < 0:
+            return 0
+        # Last position that the items from 'depth' fits entirely in room
+        position = bisect_right(self.prefix_weight, self.prefix_weight[depth] + room) - 1
+        estimate = value + self.prefix_value[position] - self.prefix_value[depth]
+        if position < self.piece_count:
+            # Fraction of the break item
+            remain = room - (self.prefix_weight[position] - self.prefix_weight[depth])
+            estimate += remain * self.items[self.order_to_branch[position]].density
+        return estimate
     
     def is_solution(self, state) -> bool:
         '''Evaluate if state is a solution.
@@ -89,7 +160,7 @@ class BranchAndBound:
         Returns:
             A boolean that indicates if the state is a solution.
         '''
-        return not -1 in state.taken
+        return state.depth == self.piece_count
 
     def is_feasible(self, state) -> bool:
         '''Evaluate if state is feasible.
@@ -103,80 +174,461 @@ class BranchAndBound:
         '''
         return state.room >= 0
 
+    def is_promising(self, estimate, best_value) -> bool:
+        '''Evaluate if a state with this estimate can improve the best value.
+                Note: The value of any solution is integer, so a state can only improve if
+                the floor of its estimate is greater than best value. A small tolerance
+                keeps an estimate that is integer up to float error.
+        
+        Args:
+            estimate (float): Optimistic estimate of value of a state.
+            best_value (int): Value of best solution known.
+
+        Returns:
+            A boolean that indicates if the state must be explored.
+        '''
+        return floor(estimate + 1e-9) > best_value
+
+    def best_value(self) -> int:
+        ''' Value of best solution known, including the solutions of other processes.
+        
+        Returns:
+            Value of best solution known, used to prune by optimality.
+        '''
+        if self.shared_best is None:
+            return self.best_state.value
+        # Reading without lock is safe, the value is only increased
+        return max(self.best_state.value, self.shared_best.get_obj().value)
+
+    def update_best(self, state) -> bool:
+        ''' Update the best state if state is better, and publish it to other processes.
+        
+        Args:
+            state (State): A namedtuple that represents a solution of knapsack problem.
+
+        Returns:
+            A boolean that indicates if the best state was improved.
+        '''
+        if state.value <= self.best_state.value:
+            return False
+        self.best_state = state
+        self.stats.improvements.append((time.time() - self.stats.start_time, state.value))
+        if self.shared_best is not None:
+            with self.shared_best.get_lock():
+                if state.value > self.shared_best.value:
+                    self.shared_best.value = state.value
+        return True
+
+    def open_bound(self) -> float:
+        ''' Best estimate of open nodes of dive, no solution better than it can be found.
+        
+        Returns:
+            Best estimate of open nodes, or the best value if the tree is closed.
+        '''
+        return max(
+            (state.estimate for state in self.open_states),
+            default=self.best_state.value
+        )
+
+    def gap(self) -> float:
+        ''' Gap between the best estimate of open nodes and the best value.
+        
+        Returns:
+            Optimality gap, 0 if the best state is proved optimal.
+        '''
+        return max(self.open_bound() - self.best_state.value, 0)
+
+    def branch(self, state):
+        ''' Create the childrens of a state, deciding the item at depth of branch order.
+                The childrens are evaluated incrementally from the parent, the right
+                children only moves the fractional bound one item ahead and the left children
+                keeps the estimate of parent, the item at depth is the first of fractional fill.
+        
+        Args:
+            state (State): A namedtuple that represents a state of knapsack problem.
+
+        Returns:
+            left (State): Children that takes the item.
+            right (State): Children that not takes the item.
+        '''
+        self.stats.nodes_expanded += 1
+        self.stats.nodes_created += 2
+        item = self.items[self.order_to_branch[state.depth]]
+        room = state.room - item.weight
+        left = State(
+            taken=state.taken | (1 << state.depth),
+            value=state.value + item.value,
+            room=room,
+            estimate=state.estimate if room >= 0 else 0,
+            depth=state.depth + 1
+        )
+        start_time = time.perf_counter()
+        estimate = self.eval_estimate(state.value, state.room, state.depth + 1)
+        self.stats.bound_time += time.perf_counter() - start_time
+        right = State(
+            taken=state.taken,
+            value=state.value,
+            room=state.room,
+            estimate=estimate,
+            depth=state.depth + 1
+        )
+        return left, right
+
+    def decode(self, state) -> list:
+        ''' Decode the bitset of a state to list of items taken, expanding the pieces.
+        
+        Args:
+            state (State): A namedtuple that represents a state of knapsack problem.
+
+        Returns:
+            taken (list[int]): List of items taken, 1 if item is took and 0 otherwise.
+        '''
+        pieces_taken = [0] * self.piece_count
+        for depth, index in enumerate(self.order_to_branch):
+            pieces_taken[index] = state.taken >> depth & 1
+        return expand_taken(pieces_taken, self.members, self.item_count)
+
+    def output(self):
+        ''' Parser the best state to specific format to submit assignment to Coursera.
+        
+        Returns:
+            output_data (str): Specific format to Coursera submission
+        '''
+        return parser_output(
+            self.best_state.value,
+            self.decode(self.best_state),
+            optimal=int(self.closed)
+        )
+
+    def dive(self, state) -> bool:
+        ''' Explore by depth the subtree of a state, updating the best state.
+                If 'deadline' is set, the dive stops when it expires and the open nodes
+                remains in 'open_states'. The 'on_improvement' callback, if is set,
+                receives the value, taken list and gap of each improved solution.
+        
+        Args:
+            state (State): A namedtuple that represents the root of subtree.
+
+        Returns:
+            A boolean that indicates if the subtree was closed.
+        '''
+        stack = self.open_states = [state]
+        stats = self.stats
+        iteration = 0
+        while stack:
+            iteration += 1
+            # Check the deadline each 1024 nodes, time.time() is expensive per node
+            if self.deadline is not None and iteration & 1023 == 0 and time.time() > self.deadline:
+                return False
+            if len(stack) > stats.max_stack_depth:
+                stats.max_stack_depth = len(stack)
+            current_state = stack.pop()
+            # Bound for infeasibility
+            if not self.is_feasible(current_state):
+                stats.pruned_infeasible += 1
+                continue
+            # Bound for optimality
+            if not self.is_promising(current_state.estimate, self.best_value()):
+                stats.pruned_bound += 1
+                continue
+            if self.is_solution(current_state):
+                stats.pruned_leaf += 1
+                if self.update_best(current_state) and self.on_improvement is not None:
+                    self.on_improvement(
+                        current_state.value, self.decode(current_state), self.gap()
+                    )
+                continue
+            # Branch
+            left, right = self.branch(current_state)
+            stack.append(right)
+            stack.append(left)
+        return True
+
     def DFS(self):
         ''' Branch based on Deep First Search. This approach mantains a stack of states and explore the tree based on depth search.
                 
                 'order_to_branch' is the order order of variables to explores based on density items, more density
                 items may explored first.
-                'depth' variable is the depth of tree that the state is.
-                'left' and 'right' are the childrens of current node.
+                'left' and 'right' are the childrens of current node, the left (take the item) is explored first.
                 The pruning is realized under three conditions, infeasible nodes, nodes domain for best solution
                 and node better than best solution.
         '''
-        stack = [self.best_state]
-        current_state = stack.pop()
-        order_to_branch = [item.index for item in sorted(self.items, key=attrgetter('density'), reverse=True)]
-        depth = current_state.depth
-        while True:
-            # Branch
-            try:
-                index_branch = order_to_branch[depth]
-            except IndexError:
-                # print('Não ha mais para onde ramificar')
+        self.closed = self.dive(self.root)
+        return self.output()
+
+    def anytime(self, time_limit, callback=None):
+        ''' Branch based on Deep First Search limited by time. The best solution found
+                is returned when the time limit expires, and it is proved optimal only if
+                the tree was closed. The gap of best solution remains available by 'gap()'.
+        
+        Args:
+            time_limit (float): Time limit in seconds.
+            callback (callable): Function called with value, taken list and gap
+                of each improved solution.
+        '''
+        self.deadline = time.time() + time_limit
+        self.on_improvement = callback
+        try:
+            self.closed = self.dive(self.root)
+        finally:
+            self.deadline = None
+            self.on_improvement = None
+        return self.output()
+
+    def best_first(self, node_limit=None):
+        ''' Branch based on Best First Search. This approach mantains a heap of states keyed by estimate
+                and always explores the most promising open node, so the search can stop as soon as
+                the best estimate of heap is worse than best solution.
+
+                If 'node_limit' is given and the heap reaches it, the most promising open nodes are
+                explored by depth (dive) until the heap is below the limit again, this keeps
+                the memory bounded by 'node_limit' nodes plus the stack of a dive.
+        
+        Args:
+            node_limit (int): Maximum number of open nodes, None is unbounded.
+        '''
+        tie_breaker = count()
+        heap = [(-self.root.estimate, 0, next(tie_breaker), self.root)]
+        stats = self.stats
+        while heap:
+            if len(heap) > stats.max_stack_depth:
+                stats.max_stack_depth = len(heap)
+            current_state = heappop(heap)[-1]
+            # Bound for optimality, no open node can be better
+            if not self.is_promising(current_state.estimate, self.best_state.value):
+                stats.pruned_bound += len(heap) + 1
                 break
-            left = current_state.taken.copy()
-            left[index_branch] = 1
-            right = current_state.taken.copy()
-            right[index_branch] = 0
-
-            stack.append(
-                State(
-                    taken=right,
-                    value=self.eval_value(right),
-                    room=self.eval_room(right),
-                    estimate=self.eval_estimate(right),
-                    depth=depth + 1
-                )
-            )
-
-            stack.append(
-                State(
-                    taken=left,
-                    value=self.eval_value(left),
-                    room=self.eval_room(left),
-                    estimate=self.eval_estimate(left),
-                    depth=depth + 1
-                )
-            )
-
-            # Bound
-            while True:
-                try:
-                    current_state = stack.pop()
-                    depth = current_state.depth
-                except IndexError:
-                    # print('Não há mais nenhum nó a ser explorado!')
-                    break
-                
+            if self.is_solution(current_state):
+                stats.pruned_leaf += 1
+                self.update_best(current_state)
+                continue
+            if node_limit is not None and len(heap) >= node_limit:
+                self.dive(current_state)
+                continue
+            # Branch
+            for child in self.branch(current_state):
+                # Bound for infeasibility and optimality
+                if not self.is_feasible(child):
+                    stats.pruned_infeasible += 1
+                elif not self.is_promising(child.estimate, self.best_state.value):
+                    stats.pruned_bound += 1
+                else:
+                    heappush(heap, (-child.estimate, -child.depth, next(tie_breaker), child))
+        self.closed = True
+        return self.output()
+
+    def eval_estimates(self, values, rooms, depths) -> np.ndarray:
+        ''' Evaluate the estimate of many states at once, it is the vectorized 'eval_estimate'.
+        
+        Args:
+            values (np.ndarray): Value of items taken of each state.
+            rooms (np.ndarray): Remain weigth in knapsack of each state.
+            depths (np.ndarray): Number of items decided of each state, in branch order.
+        
+        Returns:
+            Optimistic estimate of value of each state.
+        '''
+        start_weight = self.prefix_weight_array[depths]
+        position = np.searchsorted(self.prefix_weight_array, start_weight + rooms, side='right') - 1
+        remain = rooms - (self.prefix_weight_array[position] - start_weight)
+        estimates = (
+            values
+            + (self.prefix_value_array[position] - self.prefix_value_array[depths])
+            + remain * self.density_array[position]
+        )
+        estimates[rooms < 0] = 0
+        return estimates
+
+    def batched_DFS(self, batch_size=64):
+        ''' Branch based on Deep First Search expanding a batch of nodes at once. Up to 'batch_size'
+                open nodes are taken from the stack, and the estimates of all their childrens are
+                evaluated in a single NumPy pass, amortizing the Python overhead of bound.
+                The childrens are pushed back in order, so the search keeps the depth order.
+        
+        Args:
+            batch_size (int): Maximum number of nodes expanded at once.
+        '''
+        stack = self.open_states = [self.root]
+        stats = self.stats
+        while stack:
+            if len(stack) > stats.max_stack_depth:
+                stats.max_stack_depth = len(stack)
+            batch = []
+            while stack and len(batch) < batch_size:
+                current_state = stack.pop()
                 # Bound for infeasibility
                 if not self.is_feasible(current_state):
-                    # print('O estado atual é inviável, não há esperança de melhora ao ramificar')
+                    stats.pruned_infeasible += 1
                     continue
                 # Bound for optimality
-                if current_state.estimate < self.best_state.value:
-                    # print('O estado atual tem uma estimativa PIOR que a melhor solução obtida')
+                if not self.is_promising(current_state.estimate, self.best_value()):
+                    stats.pruned_bound += 1
                     continue
                 if self.is_solution(current_state):
-                    if current_state.value > self.best_state.value:
-                        self.best_state = current_state
+                    stats.pruned_leaf += 1
+                    self.update_best(current_state)
                     continue
-                break
-        return parser_output(
-            self.best_state.value,
-            self.best_state.taken,
-            optimal=1
-        )
+                batch.append(current_state)
+            if not batch:
+                continue
+
+            # Bound of right childrens, the left ones keep the estimate of parent
+            start_time = time.perf_counter()
+            estimates = self.eval_estimates(
+                np.array([state.value for state in batch], dtype=np.int64),
+                np.array([state.room for state in batch], dtype=np.int64),
+                np.array([state.depth + 1 for state in batch], dtype=np.int64)
+            ).tolist()
+            stats.bound_time += time.perf_counter() - start_time
+
+            # Branch, the childrens of first node of batch end on top of stack
+            stats.nodes_expanded += len(batch)
+            stats.nodes_created += 2 * len(batch)
+            for state, estimate in zip(reversed(batch), reversed(estimates)):
+                item = self.items[self.order_to_branch[state.depth]]
+                room = state.room - item.weight
+                stack.append(State(state.taken, state.value, state.room, estimate, state.depth + 1))
+                stack.append(State(
+                    state.taken | (1 << state.depth),
+                    state.value + item.value,
+                    room,
+                    state.estimate if room >= 0 else 0,
+                    state.depth + 1
+                ))
+        self.closed = True
+        return self.output()
+
+    def hybrid(self, node_limit=1_000_000):
+        ''' Branch based on Best First Search with a memory budget, when the open nodes
+                reach 'node_limit' the search dives by depth from the most promising ones.
+        
+        Args:
+            node_limit (int): Maximum number of open nodes.
+        '''
+        return self.best_first(node_limit=node_limit)
+
+    def run(self, mode='DFS', stats_file=None, **kwargs):
+        ''' Run a search mode and return the solution with the counters of search.
+        
+        Args:
+            mode (str): Name of search method, 'DFS', 'batched_DFS', 'anytime', 'best_first', 'hybrid' or 'parallel'.
+            stats_file (str): If given, the counters are appended as a JSON line to this file.
+            kwargs: Arguments of search method.
+
+        Returns:
+            output_data (str): Specific format to Coursera submission
+            stats (dict): Counters of search
+        '''
+        self.stats = SearchStats()
+        output_data = getattr(self, mode)(**kwargs)
+        if stats_file is not None:
+            self.stats.dump(stats_file, mode=mode, item_count=self.item_count, capacity=self.capacity)
+        return output_data, self.stats.as_dict()
             
+    def split(self, split_depth):
+        ''' Expand the tree by breadth until 'split_depth', the open nodes are independent subproblems.
+        
+        Args:
+            split_depth (int): Depth of tree to split.
+
+        Returns:
+            frontier (list[State]): Open nodes at 'split_depth', or leafs above it.
+        '''
+        frontier = [self.root]
+        for _ in range(min(split_depth, self.piece_count)):
+            children = []
+            for state in frontier:
+                if self.is_solution(state):
+                    children.append(state)
+                    continue
+                children.extend(
+                    child for child in self.branch(state)
+                    if self.is_feasible(child) and self.is_promising(child.estimate, self.best_value())
+                )
+            frontier = children
+        # Most promising subproblems first
+        frontier.sort(key=attrgetter('estimate'), reverse=True)
+        return frontier
+
+    def parallel(self, max_workers=None, split_depth=None, serial_time=None):
+        ''' Branch and Bound in parallel processes. The tree is split at a fixed depth
+                in independent subproblems, each one explored by depth in a worker.
+                The workers share the value of best solution, so every worker prunes
+                against the global best.
+
+                The report of search is stored in 'parallel_report', with nodes expanded by worker,
+                the utilization (time of workers over wall time, how many cpus were busy) and
+                the speedup (serial time over wall time) if the serial time is given.
+        
+        Args:
+            max_workers (int): Number of processes, default is the number of cpus.
+            split_depth (int): Depth of tree to split, default gives about 8 subproblems by worker.
+            serial_time (float): Wall time in seconds of serial search ('DFS') of same instance.
+        '''
+        max_workers = max_workers or os.cpu_count() or 1
+        if split_depth is None:
+            split_depth = ceil(log2(max_workers * 8))
+        start_time = time.time()
+        frontier = self.split(split_depth)
+
+        self.shared_best = Value('q', self.best_state.value)
+        workers = {}
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self, self.shared_best)
+        ) as executor:
+            for value, taken, stats, elapsed_time, pid in executor.map(_dive_worker, frontier):
+                self.update_best(State(taken, value, None, value, self.piece_count))
+                self.stats.merge(stats)
+                report = workers.setdefault(pid, {'subproblems': 0, 'nodes_expanded': 0, 'time': 0.0})
+                report['subproblems'] += 1
+                report['nodes_expanded'] += stats['nodes_expanded']
+                report['time'] += elapsed_time
+        wall_time = time.time() - start_time
+        self.shared_best = None
+        self.closed = True
+
+        self.parallel_report = {
+            'subproblems': len(frontier),
+            'split_depth': split_depth,
+            'wall_time': wall_time,
+            'utilization': sum(report['time'] for report in workers.values()) / wall_time,
+            'speedup': serial_time / wall_time if serial_time is not None else None,
+            'workers': list(workers.values())
+        }
+        return self.output()
+
+# Branch and Bound of worker process, set by _init_worker
+_worker_bnb = None
+
+def _init_worker(bnb, shared_best):
+    """ Initialize the worker process with the knapsack instance and the shared best value. """
+    global _worker_bnb
+    _worker_bnb = bnb
+    _worker_bnb.shared_best = shared_best
+
+def _dive_worker(state):
+    """ Explore by depth a subproblem in the worker process.
+
+    Args:
+        state (State): A namedtuple that represents the root of subproblem.
+
+    Returns:
+        Value and bitset of best solution of subproblem, counters of search, time and process id.
+    """
+    start_time = time.time()
+    _worker_bnb.best_state = _worker_bnb.root
+    _worker_bnb.stats = SearchStats()
+    _worker_bnb.dive(state)
+    return (
+        _worker_bnb.best_state.value,
+        _worker_bnb.best_state.taken,
+        _worker_bnb.stats.as_dict(),
+        time.time() - start_time,
+        os.getpid()
+    )
+
 def main(input_data):
     bnb = BranchAndBound(input_data)
     return bnb.DFS()
\ No newline at end of file
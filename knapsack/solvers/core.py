@@ -0,0 +1,108 @@
+from operator import attrgetter
+from solvers.branch_and_bound import BranchAndBound
+from solvers.dynamic_programming import divide_and_conquer
+from solvers.reduction import reduce_capacity
+from solvers.utils import parser_input, parser_output
+
+def reduce_core(capacity, items):
+    """ Fix the items whose reduced cost shows that can't change state against
+        the greedy lower bound, the remain items are the core of problem.
+
+        The items are sorted by density and the break item is the first that
+        does not fit in knapsack. With the density of break item as dual price,
+        the reduced cost of item j is v_j - r * w_j and the linear programming
+        bound with item j out of its greedy state is U - |v_j - r * w_j|.
+        If this bound is not better than the greedy value, the item is fixed.
+        Note: All comparisons are multiplied by the weight of break item to keep integers.
+
+    Args:
+        capacity (int): The capacity of knapsack
+        items (list[Item]): List of items to choose
+    
+    Returns:
+        lower_bound (int): Value of greedy solution
+        greedy_taken (list[int]): Greedy solution, by item index
+        fixed (list[Item]): Items fixed to be taken
+        core (list[Item]): Items not fixed
+    """
+    items_sorted = sorted(items, key=attrgetter('density'), reverse=True)
+    greedy_taken = [0] * len(items)
+
+    # Break item, the first item that does not fit in the greedy fill by density
+    room = capacity
+    upper_value = 0
+    break_position = len(items_sorted)
+    for position, item in enumerate(items_sorted):
+        if item.weight > room:
+            break_position = position
+            break
+        room -= item.weight
+        upper_value += item.value
+        greedy_taken[item.index] = 1
+    if break_position == len(items_sorted):
+        # All items fit in knapsack
+        return upper_value, greedy_taken, items_sorted, []
+
+    # Greedy lower bound, keep filling after break item
+    lower_bound = upper_value
+    for item in items_sorted[break_position + 1:]:
+        if item.weight <= room:
+            room -= item.weight
+            lower_bound += item.value
+            greedy_taken[item.index] = 1
+
+    break_item = items_sorted[break_position]
+    prefix_weight = capacity - sum(item.weight for item in items_sorted[:break_position])
+    # Linear programming bound U multiplied by weight of break item
+    upper_bound = upper_value * break_item.weight + prefix_weight * break_item.value
+
+    fixed, core = [], []
+    for position, item in enumerate(items_sorted):
+        reduced_cost = abs(item.value * break_item.weight - break_item.value * item.weight)
+        # floor(U - |reduced cost|) <= lower bound
+        if upper_bound - reduced_cost < (lower_bound + 1) * break_item.weight:
+            if position < break_position:
+                fixed.append(item)
+        else:
+            core.append(item)
+    return lower_bound, greedy_taken, fixed, core
+
+def core_problem(input_data, table_limit=1 << 32):
+    """ Core problem aprouch to solve knapsack problem, the items fixed by reduced cost
+        are removed and only the core is solved by an exact method, Dynamic Programming if
+        the table of core is below 'table_limit' cells and Branch and Bound otherwise.
+
+    Args:
+        input_data (str): The data of knapsack instance
+        table_limit (int): Maximum number of cells of Dynamic Programming table
+    
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
+    item_count, capacity, items = parser_input(input_data)
+    lower_bound, greedy_taken, fixed, core = reduce_core(capacity, items)
+
+    core_capacity = capacity - sum(item.weight for item in fixed)
+    taken = [0] * item_count
+    for item in fixed:
+        taken[item.index] = 1
+
+    core_capacity, core, _ = reduce_capacity(core_capacity, core)
+    if len(core) * (core_capacity + 1) <= table_limit:
+        divide_and_conquer(core_capacity, core, taken)
+    else:
+        core_data = f'{len(core)} {core_capacity}\n' + '\n'.join(
+            f'{item.value} {item.weight}' for item in core
+        )
+        bnb = BranchAndBound(core_data)
+        bnb.DFS()
+        for item, took in zip(core, bnb.decode(bnb.best_state)):
+            taken[item.index] = took
+
+    value = sum(item.value for item in items if taken[item.index])
+    # No solution better than greedy in core, then greedy is optimal
+    if value < lower_bound:
+        value, taken = lower_bound, greedy_taken
+
+    output_data = parser_output(value, taken, optimal=1)
+    return output_data
@@ -0,0 +1,53 @@
+import os
+import numpy as np
+from ortools.sat.python import cp_model
+from solvers.greedy import best_greedy
+from solvers.utils import parser_input, parser_output
+
+def constraint_programming(input_data, time_limit=60.0, num_workers=None):
+    """ Constraint Programming aprouch (OR-Tools CP-SAT) to solve knapsack problem.
+        The search starts from a hint given by the best greedy (by density, value and weight,
+        or the best single item), respects the time limit and runs parallel search workers.
+        The solution is proved optimal only if the solver closes the search before the time limit.
+
+    Args:
+        input_data (str): The data of knapsack instance
+        time_limit (float): Time limit in seconds
+        num_workers (int): Number of parallel search workers, default is the number of cpus
+    
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
+    item_count, capacity, items = parser_input(input_data)
+
+    model = cp_model.CpModel()
+    # Variables
+    taken = [model.NewBoolVar(f'x{item.index}') for item in items]
+
+    # Constraints
+    model.Add(sum(item.weight * x for item, x in zip(items, taken)) <= capacity)
+
+    # Objective Function
+    model.Maximize(sum(item.value * x for item, x in zip(items, taken)))
+
+    # Warm start
+    values = np.array([item.value for item in items], dtype=np.int64)
+    weights = np.array([item.weight for item in items], dtype=np.int64)
+    greedy_value, greedy_taken = best_greedy(capacity, values, weights)
+    greedy_taken = greedy_taken.astype(int).tolist()
+    for x, took in zip(taken, greedy_taken):
+        model.AddHint(x, took)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_search_workers = num_workers or os.cpu_count() or 1
+    status = solver.Solve(model)
+
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        # No solution in time limit, the hint is feasible
+        return parser_output(greedy_value, greedy_taken)
+
+    solution = [int(solver.Value(x)) for x in taken]
+    value = sum(item.value for item in items if solution[item.index])
+    output_data = parser_output(value, solution, optimal=int(status == cp_model.OPTIMAL))
+    return output_data
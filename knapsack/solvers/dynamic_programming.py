@@ -1,59 +1,206 @@
-import sys
+import numpy as np
+from collections import OrderedDict
+from solvers.reduction import compress_items, expand_taken, reduce_capacity
 from solvers.utils import parser_input, parser_output
 
 def fill_optimal_table(capacity, items):
     """ Fill the optimal table to avoid recursion.
-        optimal_table[capacity][index] means the optimal value for this capacity
-        with number items equal index number evalueted.
+        Only one row of values is kept in memory, optimal_row[k] means the optimal
+        value for capacity k with the items evaluated so far. The decision of each
+        item is stored in a bit-packed matrix, decisions[index] has the bit k set
+        if the item was taken to reach the optimal value of capacity k.
 
     Args:
         capacity (int): The capacity of knapsack
         items (list[Item]): List of items to choose
     
     Returns:
-        optimal_table (list[list[int]]): 2D array with the optimal value
+        optimal_row (np.ndarray): 1D array with the optimal value
             for each weight of knapsack
+        decisions (np.ndarray): 2D array of shape (number_of_items x ceil((capacity + 1) / 8))
+            with the take/skip decision of each item packed in bits
     """
-    # Create a 2D array of shape (number_of_items x capacity_of_knapsack) with 0 values.
-    optimal_table = [
-        [0 for _ in range(len(items))] for _ in range(capacity + 1)
-    ]
+    optimal_row = np.zeros(capacity + 1, dtype=np.int64)
+    decisions = np.zeros((len(items), (capacity + 8) // 8), dtype=np.uint8)
+    took = np.zeros(capacity + 1, dtype=bool)
 
     # Logic of Dynamic Programming.
-    for item in items:
-        for k in range(1, capacity + 1):
-            if item.weight <= k:
-                optimal_table[k][item.index] = max(
-                    optimal_table[k][item.index - 1],
-                    item.value + optimal_table[k - item.weight][item.index - 1]
-                )
-            else:
-                optimal_table[k][item.index] = optimal_table[k][item.index - 1]
-    return optimal_table
-
-def trace(optimal_table, items):
-    """ Trace the items taken from a optimal table.
+    for index, item in enumerate(items):
+        if item.weight > capacity:
+            continue
+        candidate = optimal_row[:capacity + 1 - item.weight] + item.value
+        took[:item.weight] = False
+        np.greater(candidate, optimal_row[item.weight:], out=took[item.weight:])
+        np.maximum(optimal_row[item.weight:], candidate, out=optimal_row[item.weight:])
+        decisions[index] = np.packbits(took)
+    return optimal_row, decisions
+
+def fill_optimal_row(capacity, items, buffer=None):
+    """ Fill only the last row of the optimal table, without the decisions.
+        optimal_row[k] means the optimal value for capacity k using all items.
+        The candidate values of each item are written in 'buffer', so no row
+        is allocated by item.
 
     Args:
-        optimal_table (list[list[int]]): 2D array with the optimal value
+        capacity (int): The capacity of knapsack
+        items (list[Item]): List of items to choose
+        buffer (np.ndarray): int64 array with at least capacity + 1 positions
+            to reuse, default is None (allocate one)
+    
+    Returns:
+        optimal_row (np.ndarray): 1D array with the optimal value
             for each weight of knapsack
+    """
+    optimal_row = np.zeros(capacity + 1, dtype=np.int64)
+    if buffer is None:
+        buffer = np.empty(capacity + 1, dtype=np.int64)
+    for item in items:
+        if item.weight > capacity:
+            continue
+        candidate = buffer[:capacity + 1 - item.weight]
+        np.add(optimal_row[:capacity + 1 - item.weight], item.value, out=candidate)
+        np.maximum(optimal_row[item.weight:], candidate, out=optimal_row[item.weight:])
+    return optimal_row
+
+def trace(decisions, items, capacity):
+    """ Trace the items taken from the bit-packed decisions matrix.
+
+    Args:
+        decisions (np.ndarray): 2D array with the take/skip decision
+            of each item packed in bits
         items (list[Item]): List of items to choose
+        capacity (int): The capacity of knapsack
     
     Returns:
         taken (list[int]): List of items taken, a solution of problem
     """
-    num_items = len(items)
-    capacity = len(optimal_table) - 1
-    taken = [0] * num_items
-    
-    for index in range(num_items - 1, 0, -1):
-        if optimal_table[capacity][index] != optimal_table[capacity][index - 1]:
+    taken = [0] * len(items)
+
+    for index in range(len(items) - 1, -1, -1):
+        # np.packbits is big-endian, the bit of capacity k is the (7 - k % 8) of byte k // 8
+        if decisions[index, capacity >> 3] >> (7 - (capacity & 7)) & 1:
             taken[index] = 1
             capacity -= items[index].weight
     return taken
 
+def is_subset_sum(items) -> bool:
+    """ Evaluate if the instance is a subset-sum problem, every item has value equal to weight.
+
+    Args:
+        items (list[Item]): List of items to choose
+    
+    Returns:
+        A boolean that indicates if the instance is a subset-sum problem.
+    """
+    return all(item.value == item.weight for item in items)
+
+def subset_sum(capacity, items):
+    """ Subset-sum solved by reachability, the bit k of a Python big int is set if some set of
+        items weighs k, and each item is a shift-or, one machine word by 64 capacities.
+        To trace the solution, the reachable sets are kept only at every 'block' items
+        (checkpoints), the sets inside a block are rebuilt from its checkpoint when the
+        trace arrives at it. So the memory is O(sqrt(n) * capacity) bits.
+
+    Args:
+        capacity (int): The capacity of knapsack
+        items (list[Item]): List of items to choose
+    
+    Returns:
+        weight (int): Best weight reachable, not greater than capacity
+        taken (list[int]): List of items taken by position, a solution of problem
+    """
+    mask = (1 << (capacity + 1)) - 1
+    block = max(1, int(len(items) ** 0.5))
+    # checkpoints[b] is the reachable set before the item b * block
+    checkpoints = []
+    reachable = 1
+    for position, item in enumerate(items):
+        if position % block == 0:
+            checkpoints.append(reachable)
+        reachable = (reachable | reachable << item.weight) & mask
+    weight = reachable.bit_length() - 1
+
+    taken = [0] * len(items)
+    target = weight
+    for start in range((len(checkpoints) - 1) * block, -1, -block):
+        end = min(start + block, len(items))
+        # Reachable sets before each item of block
+        sets = [checkpoints[start // block]]
+        for item in items[start:end - 1]:
+            sets.append((sets[-1] | sets[-1] << item.weight) & mask)
+        for position in range(end - 1, start - 1, -1):
+            # If target is not reachable without the item, the item is taken
+            if not sets[position - start] >> target & 1:
+                taken[position] = 1
+                target -= items[position].weight
+    return weight, taken
+
 def dynamic_programming(input_data):
-    """ Dynamic Programming aprouch to solve knapsack problem
+    """ Dynamic Programming aprouch to solve knapsack problem.
+        Subset-sum instances (value equal to weight) are solved by the bitset engine.
+
+    Args:
+        input_data (str): The data of knapsack instance
+    
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
+    item_count, capacity, items = parser_input(input_data)
+    subset_sum_instance = is_subset_sum(items)
+    pieces, members = compress_items(capacity, items)
+    capacity, pieces, _ = reduce_capacity(capacity, pieces)
+    if subset_sum_instance:
+        _, reduced_taken = subset_sum(capacity, pieces)
+    else:
+        optimal_row, decisions = fill_optimal_table(capacity, pieces)
+        reduced_taken = trace(decisions, pieces, capacity)
+    pieces_taken = [0] * len(members)
+    for piece, took in zip(pieces, reduced_taken):
+        pieces_taken[piece.index] = took
+    taken = expand_taken(pieces_taken, members, item_count)
+    value = sum(item.value for item in items if taken[item.index])
+
+    output_data = parser_output(value, taken, optimal=1)
+    return output_data
+
+def divide_and_conquer(capacity, items, taken, table_limit=1 << 26):
+    """ Recover the items taken in O(capacity) memory, Hirschberg style.
+        The items are split in two halves, the forward row of the first half and
+        the row of the second half give the best split of capacity between them,
+        then each half is solved recursively with its share of capacity.
+        At most three rows of capacity + 1 int64 are alive, the two rows and the
+        buffer of candidates, and they are released before the recursion.
+
+    Args:
+        capacity (int): The capacity of knapsack
+        items (list[Item]): List of items to choose
+        taken (list[int]): List of items taken, filled in place by item index
+        table_limit (int): Number of bits of the decisions matrix below which
+            the subproblem is solved directly with fill_optimal_table
+    """
+    capacity = min(capacity, sum(item.weight for item in items))
+    if capacity == 0 or not items:
+        return
+    if len(items) == 1 or len(items) * (capacity + 1) <= table_limit:
+        _, decisions = fill_optimal_table(capacity, items)
+        for item, took in zip(items, trace(decisions, items, capacity)):
+            taken[item.index] = took
+        return
+
+    middle = len(items) // 2
+    buffer = np.empty(capacity + 1, dtype=np.int64)
+    forward_row = fill_optimal_row(capacity, items[:middle], buffer)
+    backward_row = fill_optimal_row(capacity, items[middle:], buffer)
+    del buffer
+    np.add(forward_row, backward_row[::-1], out=forward_row)
+    split = int(np.argmax(forward_row))
+    del forward_row, backward_row
+
+    divide_and_conquer(split, items[:middle], taken, table_limit)
+    divide_and_conquer(capacity - split, items[middle:], taken, table_limit)
+
+def hirschberg(input_data):
+    """ Linear memory Dynamic Programming aprouch to solve knapsack problem
 
     Args:
         input_data (str): The data of knapsack instance
@@ -62,9 +209,96 @@ def dynamic_programming(input_data):
         output_data (str): Specific format to submit assignment to Coursera
     """
     item_count, capacity, items = parser_input(input_data)
-    optimal_table = fill_optimal_table(capacity, items)
-    value = optimal_table[capacity][item_count - 1]
-    taken = trace(optimal_table, items)
+    pieces, members = compress_items(capacity, items)
+    pieces_taken = [0] * len(members)
+    capacity, pieces, _ = reduce_capacity(capacity, pieces)
+    divide_and_conquer(capacity, pieces, pieces_taken)
+    taken = expand_taken(pieces_taken, members, item_count)
+    value = sum(item.value for item in items if taken[item.index])
 
     output_data = parser_output(value, taken, optimal=1)
-    return output_data
\ No newline at end of file
+    return output_data
+
+
+class CapacityTable:
+    """Dynamic Programming table built once for a maximum capacity, answering the optimal
+        value and solution of any capacity up to it. The last row of table has the optimal
+        value of every capacity and the bit-packed decisions trace the solution of any of them.
+        The solutions are cached with LRU eviction, limited by 'cache_memory' bytes.
+    
+    Args:
+        input_data (str): The data of knapsack instance, its capacity is the maximum capacity
+        max_capacity (int): Maximum capacity to query, default is the capacity of instance
+        cache_memory (int): Approximate memory in bytes for cached solutions
+    """
+    def __init__(self, input_data, max_capacity=None, cache_memory=1 << 26):
+        self.item_count, capacity, items = parser_input(input_data)
+        self.max_capacity = capacity if max_capacity is None else max_capacity
+        # Only the divisor reduction of dynamic_programming, not compress_items: it limits
+        # the copies of items by capacity, so it is not valid for every query.
+        # Queries are mapped to the reduced capacity
+        self.capacity, self.items, self.divisor = reduce_capacity(self.max_capacity, items)
+        self.optimal_row, self.decisions = fill_optimal_table(self.capacity, self.items)
+        # Each cached solution is a list of item_count ints
+        self.cache_size = max(1, cache_memory // (8 * max(1, self.item_count)))
+        self.cache = OrderedDict()
+
+    def reduced_capacity(self, capacity) -> int:
+        """ Map a capacity to the capacity of reduced table.
+        
+        Args:
+            capacity (int): The capacity of knapsack
+
+        Returns:
+            Capacity of reduced table with the same optimal solution.
+        """
+        if not 0 <= capacity <= self.max_capacity:
+            raise ValueError(f'capacity must be between 0 and {self.max_capacity}, got {capacity}')
+        return min(capacity // self.divisor, self.capacity)
+
+    def best(self, capacity) -> int:
+        """ Optimal value of knapsack with the given capacity.
+        
+        Args:
+            capacity (int): The capacity of knapsack
+
+        Returns:
+            Optimal value.
+        """
+        return int(self.optimal_row[self.reduced_capacity(capacity)])
+
+    def solution(self, capacity):
+        """ Optimal solution of knapsack with the given capacity.
+        
+        Args:
+            capacity (int): The capacity of knapsack
+
+        Returns:
+            value (int): Optimal value
+            taken (list[int]): List of items taken, a solution of problem (a copy of cached one)
+        """
+        capacity = self.reduced_capacity(capacity)
+        if capacity in self.cache:
+            self.cache.move_to_end(capacity)
+        else:
+            taken = [0] * self.item_count
+            for item, took in zip(self.items, trace(self.decisions, self.items, capacity)):
+                taken[item.index] = took
+            self.cache[capacity] = int(self.optimal_row[capacity]), taken
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        # The caller may change its list, the cached one is kept
+        value, taken = self.cache[capacity]
+        return value, list(taken)
+
+    def output(self, capacity):
+        """ Optimal solution of knapsack with the given capacity in output format.
+        
+        Args:
+            capacity (int): The capacity of knapsack
+
+        Returns:
+            output_data (str): Specific format to submit assignment to Coursera
+        """
+        value, taken = self.solution(capacity)
+        return parser_output(value, taken, optimal=1)
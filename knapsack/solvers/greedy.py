@@ -1,6 +1,7 @@
+import numpy as np
 from operator import attrgetter
 from random import shuffle
-from solvers.utils import parser_input, parser_output
+from solvers.utils import parser_input, parser_input_arrays, parser_output
 
 def priority_value(input_data):
     """ Greedly insert items in knapsack based on value 
@@ -91,4 +92,83 @@ def random_solution(input_data):
             value += item.value
             weight += item.weight
     output_data = parser_output(value, taken)
+    return output_data
+
+def fill_in_order(order, capacity, weights):
+    """ Greedly insert items in knapsack following an order, skipping the items that not fit.
+        Each round takes the longest prefix of the remain items that fits by cumulative sum,
+        the item that stops the prefix does not fit anymore and is discarded in next round.
+
+    Args:
+        order (np.ndarray): Indexes of items in order of priority
+        capacity (int): The capacity of knapsack
+        weights (np.ndarray): Weight of each item
+    
+    Returns:
+        taken (np.ndarray): Boolean array of items taken
+    """
+    taken = np.zeros(len(weights), dtype=bool)
+    room = capacity
+    while len(order):
+        order = order[weights[order] <= room]
+        fits = np.cumsum(weights[order]) <= room
+        prefix = order[fits]
+        if not len(prefix):
+            break
+        taken[prefix] = True
+        room -= weights[prefix].sum()
+        order = order[~fits]
+    return taken
+
+def best_greedy(capacity, values, weights):
+    """ Best of the greedy by density, value and weight, and the best single item.
+        Note: The best of density greedy and best single item is a 1/2-approximation.
+
+    Args:
+        capacity (int): The capacity of knapsack
+        values (np.ndarray): Value of each item
+        weights (np.ndarray): Weight of each item
+    
+    Returns:
+        best_value (int): Value of best greedy solution
+        best_taken (np.ndarray): Boolean array of items taken
+    """
+    orders = [
+        np.argsort(-values / weights, kind='stable'),
+        np.argsort(-values, kind='stable'),
+        np.argsort(-weights, kind='stable'),
+    ]
+
+    best_value = 0
+    best_taken = np.zeros(len(values), dtype=bool)
+    for order in orders:
+        taken = fill_in_order(order, capacity, weights)
+        value = int(values[taken].sum())
+        if value > best_value:
+            best_value, best_taken = value, taken
+
+    # Best single item that fits
+    fits = np.flatnonzero(weights <= capacity)
+    if len(fits):
+        best_item = fits[np.argmax(values[fits])]
+        if values[best_item] > best_value:
+            best_value = int(values[best_item])
+            best_taken = np.zeros(len(values), dtype=bool)
+            best_taken[best_item] = True
+    return best_value, best_taken
+
+def greedy_portfolio(input_data):
+    """ Greedly insert items in knapsack based on density, value and weight, and the best single item,
+        returning the best of them. The instance is parsed once in NumPy arrays.
+
+    Args:
+        input_data (str): The data of knapsack instance
+    
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
+    item_count, capacity, values, weights = parser_input_arrays(input_data)
+    best_value, best_taken = best_greedy(capacity, values, weights)
+
+    output_data = parser_output(best_value, best_taken.astype(int).tolist())
     return output_data
\ No newline at end of file
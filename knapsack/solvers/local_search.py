@@ -0,0 +1,295 @@
+import bisect
+import time
+import numpy as np
+from operator import attrgetter
+from solvers.dynamic_programming import fill_optimal_table, trace
+from solvers.greedy import best_greedy
+from solvers.utils import parser_input, parser_output
+
+class CandidateLists:
+    """ Candidate items to enter and to leave the knapsack, based on density.
+        to_add has the ranks of the 'size' items not taken with more density and
+        to_remove has the ranks of the 'size' items taken with less density, both sorted.
+        The lists are updated incrementally when an item is flipped, scanning only
+        from the border of list to find the next candidate.
+
+    Args:
+        order (list[int]): Indexes of items sorted by density, more density first
+        taken (list[int]): List of items taken, shared with the local search
+        size (int): Size of candidate lists
+    """
+    def __init__(self, order, taken, size):
+        self.order = order
+        self.taken = taken
+        self.size = size
+        self.rank = [0] * len(order)
+        for rank, index in enumerate(order):
+            self.rank[index] = rank
+        self.to_add, self.to_remove = [], []
+        self.refill_add()
+        self.refill_remove()
+
+    def refill_add(self):
+        """ Complete to_add with the next items not taken after its last rank """
+        rank = self.to_add[-1] + 1 if self.to_add else 0
+        while len(self.to_add) < self.size and rank < len(self.order):
+            if not self.taken[self.order[rank]]:
+                self.to_add.append(rank)
+            rank += 1
+
+    def refill_remove(self):
+        """ Complete to_remove with the previous items taken before its first rank """
+        rank = self.to_remove[0] - 1 if self.to_remove else len(self.order) - 1
+        while len(self.to_remove) < self.size and rank >= 0:
+            if self.taken[self.order[rank]]:
+                self.to_remove.insert(0, rank)
+            rank -= 1
+
+    def flip(self, index):
+        """ Update the lists after the item was flipped in taken.
+
+        Args:
+            index (int): Index of item flipped
+        """
+        rank = self.rank[index]
+        # Items not taken with rank before the last of to_add are all in to_add, same for to_remove
+        if self.taken[index]:
+            position = bisect.bisect_left(self.to_add, rank)
+            if position < len(self.to_add) and self.to_add[position] == rank:
+                del self.to_add[position]
+                self.refill_add()
+            if not self.to_remove or rank > self.to_remove[0] or len(self.to_remove) < self.size:
+                bisect.insort(self.to_remove, rank)
+                if len(self.to_remove) > self.size:
+                    del self.to_remove[0]
+        else:
+            position = bisect.bisect_left(self.to_remove, rank)
+            if position < len(self.to_remove) and self.to_remove[position] == rank:
+                del self.to_remove[position]
+                self.refill_remove()
+            if not self.to_add or rank < self.to_add[-1] or len(self.to_add) < self.size:
+                bisect.insort(self.to_add, rank)
+                if len(self.to_add) > self.size:
+                    del self.to_add[-1]
+
+def pair_sums(values, weights):
+    """ Value and weight of each pair of items.
+
+    Args:
+        values (np.ndarray): Value of each item
+        weights (np.ndarray): Weight of each item
+
+    Returns:
+        first (np.ndarray): Position of first item of each pair
+        second (np.ndarray): Position of second item of each pair
+        values (np.ndarray): Value of each pair
+        weights (np.ndarray): Weight of each pair
+    """
+    first, second = np.triu_indices(len(values), k=1)
+    return first, second, values[first] + values[second], weights[first] + weights[second]
+
+def best_move(values, weights, room, lists, tabu=()):
+    """ Find the best improving move among 1-flip, 1-1 swap and 2-1 swap, in this order.
+        The 2-1 swap exchanges two items by one in both directions, two taken items
+        by one item not taken and one taken item by two items not taken.
+        Only items of candidate lists are evaluated, so the cost does not depend on
+        number of items, and each class of moves is evaluated at once with NumPy.
+
+    Args:
+        values (np.ndarray): Value of each item
+        weights (np.ndarray): Weight of each item
+        room (int): Remain weigth in knapsack
+        lists (CandidateLists): Candidate items to enter and to leave
+        tabu (set[int]): Items that can't be added
+
+    Returns:
+        move (tuple): Items to remove and items to add, or None if there is no improving move
+    """
+    to_add = np.array([lists.order[rank] for rank in lists.to_add if lists.order[rank] not in tabu], dtype=np.int64)
+    to_remove = np.array([lists.order[rank] for rank in lists.to_remove], dtype=np.int64)
+    add_values, add_weights = values[to_add], weights[to_add]
+    remove_values, remove_weights = values[to_remove], weights[to_remove]
+
+    # 1-flip, add the most valuable item that fits
+    gains = np.where(add_weights <= room, add_values, 0)
+    if len(gains) and gains.max() > 0:
+        return (), (int(to_add[gains.argmax()]),)
+    if not len(to_add) or not len(to_remove):
+        return None
+
+    # 1-1 swap, remove one item and add other
+    gains = add_values[None, :] - remove_values[:, None]
+    gains[add_weights[None, :] - remove_weights[:, None] > room] = 0
+    if gains.max() > 0:
+        i, j = np.unravel_index(gains.argmax(), gains.shape)
+        return (int(to_remove[i]),), (int(to_add[j]),)
+
+    # 2-1 swap, remove two items and add other
+    first, second, pair_values, pair_weights = pair_sums(remove_values, remove_weights)
+    gains = add_values[None, :] - pair_values[:, None]
+    gains[add_weights[None, :] - pair_weights[:, None] > room] = 0
+    best_gain, move = 0, None
+    if gains.size and gains.max() > best_gain:
+        i, j = np.unravel_index(gains.argmax(), gains.shape)
+        best_gain = gains[i, j]
+        move = (int(to_remove[first[i]]), int(to_remove[second[i]])), (int(to_add[j]),)
+    # 2-1 swap, remove one item and add two others
+    first, second, pair_values, pair_weights = pair_sums(add_values, add_weights)
+    gains = pair_values[None, :] - remove_values[:, None]
+    gains[pair_weights[None, :] - remove_weights[:, None] > room] = 0
+    if gains.size and gains.max() > best_gain:
+        i, j = np.unravel_index(gains.argmax(), gains.shape)
+        move = (int(to_remove[i]),), (int(to_add[first[j]]), int(to_add[second[j]]))
+    return move
+
+def free_items(lists, size, rng):
+    """ Items to free in a perturbation, the items around the break item (first item
+        not taken by density) and random items of the candidate lists.
+
+    Args:
+        lists (CandidateLists): Candidate items to enter and to leave
+        size (int): Number of items to free
+        rng (np.random.Generator): Random generator
+
+    Returns:
+        freed (list[int]): Indexes of freed items
+    """
+    item_count = len(lists.order)
+    split = lists.to_add[0] if lists.to_add else item_count
+    half = size // 2
+    core = set(range(max(0, split - half // 2), min(item_count, split + half - half // 2)))
+    window = set(range(max(0, split - lists.size), min(item_count, split + lists.size)))
+    window = sorted((window | set(lists.to_remove)) - core)
+    count = min(size - len(core), len(window))
+    ranks = list(core) + rng.choice(window, size=count, replace=False).tolist()
+    return [lists.order[rank] for rank in ranks]
+
+def dantzig_bound(capacity, items, order) -> int:
+    """ Floor of linear programming bound, fill by density and a fraction of break item.
+
+    Args:
+        capacity (int): The capacity of knapsack
+        items (list[Item]): List of items to choose
+        order (list[int]): Indexes of items sorted by density, more density first
+
+    Returns:
+        Upper bound of value of any solution
+    """
+    room, bound = capacity, 0
+    for index in order:
+        item = items[index]
+        if item.weight > room:
+            return bound + room * item.value // item.weight
+        room -= item.weight
+        bound += item.value
+    return bound
+
+def local_search(capacity, items, taken, time_limit=10, candidates=50, free=40,
+                 strength=3, repair_cells=1 << 26, seed=None):
+    """ Improve a solution with 1-flip, 1-1 swap and 2-1 swap moves until the time limit
+        expires (iterated local search). At each local optimum, 'free' items around the
+        break item and of the candidate lists are freed. If the Dynamic Programming table
+        of the freed items and their room has at most 'repair_cells' cells, they are
+        set to the optimal choice among them (never worse). Otherwise 1 to 'strength' of
+        the freed items that are taken are removed and they are tabu in the next descent,
+        and if the new local optimum is worse the changes are undone.
+        The search stops early if the best value reaches the floor of linear bound (Dantzig).
+        Value, room and candidate lists are updated incrementally.
+
+    Args:
+        capacity (int): The capacity of knapsack
+        items (list[Item]): List of items to choose
+        taken (list[int]): List of items taken, a feasible solution
+        time_limit (float): Time limit in seconds
+        candidates (int): Size of candidate lists
+        free (int): Number of items freed by perturbation
+        strength (int): Maximum number of items removed by perturbation
+        repair_cells (int): Maximum number of cells of table to repair the freed items
+        seed (int): Seed of random generator
+
+    Returns:
+        value (int): Value of improved solution
+        taken (list[int]): List of items taken, the improved solution
+    """
+    deadline = time.time() + time_limit
+    rng = np.random.default_rng(seed)
+    taken = list(taken)
+    values = np.array([item.value for item in items], dtype=np.int64)
+    weights = np.array([item.weight for item in items], dtype=np.int64)
+    order = [item.index for item in sorted(items, key=attrgetter('density'), reverse=True)]
+    lists = CandidateLists(order, taken, candidates)
+    value = sum(item.value for item in items if taken[item.index])
+    room = capacity - sum(item.weight for item in items if taken[item.index])
+    best_value, best_taken = value, list(taken)
+    upper_bound = dantzig_bound(capacity, items, order)
+    # Items flipped since the last accepted solution, to undo
+    changes = []
+    tabu = set()
+
+    def flip(index):
+        nonlocal value, room
+        taken[index] = 1 - taken[index]
+        sign = 1 if taken[index] else -1
+        value += sign * items[index].value
+        room -= sign * items[index].weight
+        lists.flip(index)
+        changes.append(index)
+
+    while best_value < upper_bound and time.time() < deadline:
+        # Descent
+        while time.time() < deadline:
+            move = best_move(values, weights, room, lists, tabu)
+            if move is None:
+                break
+            to_remove, to_add = move
+            for index in to_remove + to_add:
+                flip(index)
+
+        if value > best_value:
+            best_value, best_taken = value, list(taken)
+        undo, changes = changes, []
+        if value < best_value:
+            for index in reversed(undo):
+                flip(index)
+            changes = []
+
+        # Perturbation
+        freed = [items[index] for index in free_items(lists, free, rng)]
+        if not freed:
+            break
+        freed_room = min(
+            room + sum(item.weight for item in freed if taken[item.index]),
+            sum(item.weight for item in freed)
+        )
+        if len(freed) * (freed_room + 1) <= repair_cells:
+            _, decisions = fill_optimal_table(freed_room, freed)
+            for item, took in zip(freed, trace(decisions, freed, freed_room)):
+                if taken[item.index] != took:
+                    flip(item.index)
+            tabu = set()
+        else:
+            removable = [item.index for item in freed if taken[item.index]]
+            count = min(len(removable), int(rng.integers(1, strength + 1)))
+            tabu = set(rng.choice(removable, size=count, replace=False).tolist()) if count else set()
+            for index in tabu:
+                flip(index)
+    return best_value, best_taken
+
+def greedy_local_search(input_data, time_limit=10):
+    """ Local search aprouch to solve knapsack problem, starting from the best greedy solution.
+
+    Args:
+        input_data (str): The data of knapsack instance
+        time_limit (float): Time limit in seconds
+
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
+    item_count, capacity, items = parser_input(input_data)
+    values = np.array([item.value for item in items], dtype=np.int64)
+    weights = np.array([item.weight for item in items], dtype=np.int64)
+    _, taken = best_greedy(capacity, values, weights)
+    value, taken = local_search(capacity, items, taken.astype(int).tolist(), time_limit)
+
+    output_data = parser_output(value, taken)
+    return output_data
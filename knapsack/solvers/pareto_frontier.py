@@ -0,0 +1,139 @@
+import numpy as np
+from solvers.branch_and_bound import BranchAndBound
+from solvers.greedy import best_greedy
+from solvers.utils import parser_input, parser_output
+
+def merge_states(weights, values, item, capacity):
+    """ Merge the states without the item with the states that take the item,
+        keeping only the non-dominated ones. A state is dominated if other state
+        has less or equal weight and greater or equal value.
+
+    Args:
+        weights (np.ndarray): Weight of each state, sorted
+        values (np.ndarray): Value of each state, strictly increasing
+        item (Item): Item to be evaluated
+        capacity (int): The capacity of knapsack
+
+    Returns:
+        weights (np.ndarray): Weight of non-dominated states, sorted
+        values (np.ndarray): Value of non-dominated states, strictly increasing
+        parents (np.ndarray): Index of each state in the previous states
+        took (np.ndarray): Boolean array, True if the state took the item
+    """
+    # States are sorted by weight, so the states that fit with item are a prefix
+    fits = int(np.searchsorted(weights, capacity - item.weight, side='right'))
+    add_weights, add_values = weights[:fits] + item.weight, values[:fits] + item.value
+
+    # Linear merge of the two sorted runs, position of each state in the merged arrays.
+    # Weights are strictly increasing in each run, a tie puts the state with item first
+    keep_position = np.arange(len(weights)) + np.searchsorted(add_weights, weights, side='right')
+    add_position = np.arange(fits) + np.searchsorted(weights, add_weights, side='left')
+    size = len(weights) + fits
+    merged_weights = np.empty(size, dtype=weights.dtype)
+    merged_values = np.empty(size, dtype=values.dtype)
+    parents = np.empty(size, dtype=np.int64)
+    took = np.zeros(size, dtype=bool)
+    merged_weights[keep_position], merged_weights[add_position] = weights, add_weights
+    merged_values[keep_position], merged_values[add_position] = values, add_values
+    parents[keep_position], parents[add_position] = np.arange(len(weights)), np.arange(fits)
+    took[add_position] = True
+    weights, values = merged_weights, merged_values
+
+    # Heavier states must be more valuable, otherwise they are dominated
+    keep = np.ones(size, dtype=bool)
+    keep[1:] = values[1:] > np.maximum.accumulate(values)[:-1]
+    # A state with the same weight of next one is dominated if it is less valuable
+    keep[:-1] &= (weights[:-1] != weights[1:]) | (values[:-1] >= values[1:])
+    return weights[keep], values[keep], parents[keep], took[keep]
+
+def trace(parents, took, layer, index, order, item_count):
+    """ Trace the items taken following the parent indexes of a state.
+
+    Args:
+        parents (list[np.ndarray]): parents[l][i] is the index in layer l of parent
+            of state i of layer l + 1
+        took (list[np.ndarray]): took[l][i] is True if state i of layer l + 1 took item order[l]
+        layer (int): Layer of state
+        index (int): Index of state in its layer
+        order (list[int]): Index of item evaluated in each layer
+        item_count (int): Number of items
+
+    Returns:
+        taken (list[int]): List of items taken, a solution of problem
+    """
+    taken = [0] * item_count
+    for step in range(layer - 1, -1, -1):
+        if took[step][index]:
+            taken[order[step]] = 1
+        index = parents[step][index]
+    return taken
+
+def pareto_frontier(input_data, max_states=1 << 24, time_limit=60):
+    """ Sparse Dynamic Programming aprouch (Nemhauser-Ullmann) to solve knapsack problem.
+        Only the non-dominated (weight, value) pairs are kept for each item,
+        so the work does not depend on the capacity of knapsack.
+        Items are evaluated by density and a state is dropped if its value plus the
+        linear bound of remaining items can't beat the best solution found, starting
+        from the greedy one. Each layer keeps only the parent index and decision
+        of its states. If more than 'max_states' states are stored,
+        Branch and Bound solves the instance.
+
+    Args:
+        input_data (str): The data of knapsack instance
+        max_states (int): Maximum number of states stored in all layers
+        time_limit (float): Time limit in seconds of Branch and Bound fallback
+
+    Returns:
+        output_data (str): Specific format to submit assignment to Coursera
+    """
+    item_count, capacity, items = parser_input(input_data)
+    values = np.array([item.value for item in items], dtype=np.int64)
+    weights = np.array([item.weight for item in items], dtype=np.int64)
+    lower_bound, greedy_taken = best_greedy(capacity, values, weights)
+    best_taken = greedy_taken.astype(int).tolist()
+
+    # Items that fit, by density, with prefix sums for the linear bound
+    items = sorted(
+        (item for item in items if item.weight <= capacity), key=lambda item: -item.density
+    )
+    order = [item.index for item in items]
+    prefix_weight = np.concatenate([[0], np.cumsum([item.weight for item in items])])
+    prefix_value = np.concatenate([[0], np.cumsum([item.value for item in items])])
+    density = np.array([item.density for item in items] + [0.0])
+
+    state_weights = np.zeros(1, dtype=np.int64)
+    state_values = np.zeros(1, dtype=np.int64)
+    parents, took = [], []
+    stored = 0
+    for step, item in enumerate(items):
+        state_weights, state_values, step_parents, step_took = merge_states(
+            state_weights, state_values, item, capacity
+        )
+        # The last state is the heaviest and so the most valuable
+        if state_values[-1] > lower_bound:
+            lower_bound = int(state_values[-1])
+            best_taken = trace(parents, took, step, step_parents[-1], order, item_count)
+            if step_took[-1]:
+                best_taken[item.index] = 1
+
+        # Linear bound of the remaining items
+        start = step + 1
+        limit = prefix_weight[start] + capacity - state_weights
+        last = np.searchsorted(prefix_weight, limit, side='right') - 1
+        fraction = (limit - prefix_weight[last]) * density[last]
+        bound = state_values + prefix_value[last] - prefix_value[start] + np.floor(fraction + 1e-9)
+        keep = bound > lower_bound
+        state_weights, state_values = state_weights[keep], state_values[keep]
+        parents.append(step_parents[keep].astype(np.int32))
+        took.append(step_took[keep])
+
+        stored += len(state_values)
+        if stored > max_states:
+            # Release the layers before the fallback
+            del parents, took, state_weights, state_values
+            return BranchAndBound(input_data).anytime(time_limit)
+        if not len(state_values):
+            break
+
+    output_data = parser_output(lower_bound, best_taken, optimal=1)
+    return output_data
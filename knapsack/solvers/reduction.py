@@ -0,0 +1,101 @@
+from math import gcd
+from solvers.utils import Item
+
+def reduce_capacity(capacity, items):
+    """ Reduce the instance to shrink the Dynamic Programming table.
+        Items heavier than capacity are dropped, the capacity is clamped to the sum
+        of weights and weights and capacity are divided by the GCD of weights.
+        The items keep their index, so the solution is mapped back by item.index.
+
+    Args:
+        capacity (int): The capacity of knapsack
+        items (list[Item]): List of items to choose
+    
+    Returns:
+        capacity (int): The capacity of reduced knapsack
+        items (list[Item]): List of items of reduced knapsack
+        divisor (int): Divisor of weights, a capacity k is mapped to k // divisor
+    """
+    items = [item for item in items if item.weight <= capacity]
+    capacity = min(capacity, sum(item.weight for item in items))
+    divisor = gcd(*(item.weight for item in items)) or 1
+    if divisor > 1:
+        # Every set of items weighs a multiple of divisor, so the floor keeps all feasible sets
+        capacity //= divisor
+        items = [
+            Item(item.index, item.value, item.weight // divisor, item.density * divisor)
+            for item in items
+        ]
+    return capacity, items, divisor
+
+def compress_items(capacity, items):
+    """ Merge identical items, limit the copies of dominated items and split each group
+        of copies in pieces of 1, 2, 4, ... copies (binary splitting), so the bounded
+        knapsack of groups is solved as a 0/1 knapsack of pieces.
+
+        An item j is dominated by i if w_i <= w_j and v_i >= v_j. If k copies of j plus all
+        its dominators exceed the capacity, some dominator is out and may replace a copy of j,
+        so at most floor((C - D_j) / w_j) copies of j are needed, D_j is the weight of dominators.
+        Note: The dominators are found in order of weight with a Fenwick tree over values.
+
+    Args:
+        capacity (int): The capacity of knapsack
+        items (list[Item]): List of items to choose
+    
+    Returns:
+        pieces (list[Item]): Items of compressed knapsack, indexed by position
+        members (list[list[int]]): Indexes of original items of each piece
+    """
+    groups = {}
+    for item in items:
+        groups.setdefault((item.value, item.weight), []).append(item.index)
+    # Lighter first and, for the same weight, more valuable first
+    kinds = sorted(groups, key=lambda kind: (kind[1], -kind[0]))
+
+    # Fenwick tree of weights by rank of value, more valuable first
+    rank = {value: position + 1 for position, value in enumerate(sorted({v for v, _ in kinds}, reverse=True))}
+    tree = [0] * (len(rank) + 1)
+
+    pieces, members = [], []
+    for value, weight in kinds:
+        indexes = groups[(value, weight)]
+        # Weight of items already seen with value greater or equal, the dominators
+        dominators = 0
+        position = rank[value]
+        while position > 0:
+            dominators += tree[position]
+            position -= position & -position
+        copies = min(len(indexes), max(capacity - dominators, 0) // weight)
+
+        # Binary splitting of copies
+        start, size = 0, 1
+        while start < copies:
+            size = min(size, copies - start)
+            pieces.append(Item(len(pieces), value * size, weight * size, value / weight))
+            members.append(indexes[start:start + size])
+            start += size
+            size *= 2
+
+        position = rank[value]
+        while position < len(tree):
+            tree[position] += weight * len(indexes)
+            position += position & -position
+    return pieces, members
+
+def expand_taken(pieces_taken, members, item_count):
+    """ Map the solution of compressed knapsack to the original items.
+
+    Args:
+        pieces_taken (list[int]): List of pieces taken
+        members (list[list[int]]): Indexes of original items of each piece
+        item_count (int): Number of original items
+    
+    Returns:
+        taken (list[int]): List of items taken, a solution of problem
+    """
+    taken = [0] * item_count
+    for took, indexes in zip(pieces_taken, members):
+        if took:
+            for index in indexes:
+                taken[index] = 1
+    return taken
@@ -0,0 +1,165 @@
+import os
+from math import ceil, sqrt
+from operator import attrgetter
+from solvers.core import reduce_core
+from solvers.dynamic_programming import is_subset_sum
+from solvers.reduction import reduce_capacity
+from solvers.utils import parser_input
+
+# Maximum number of cells of Dynamic Programming table, about a minute of NumPy work
+DP_CELL_LIMIT = 1 << 32
+# Fraction of available memory that Dynamic Programming may use
+MEMORY_FRACTION = 0.5
+# Bytes by unit of capacity of the rows of table mode: int64 row, two int64 candidates
+# alive while the next one is allocated and the took flags, besides the bit-packed table
+DP_ROW_BYTES = 25
+# Bytes by unit of capacity of linear mode: forward and backward int64 rows and the buffer
+LINEAR_DP_ROW_BYTES = 24
+# Relative gap between linear bound and greedy below which Branch and Bound is expected to close
+BNB_GAP_LIMIT = 0.01
+# Maximum number of items of CP-SAT model
+CP_SAT_ITEM_LIMIT = 100_000
+# Maximum number of items of Pareto frontier, its states don't depend on capacity
+PARETO_ITEM_LIMIT = 1_000
+
+def available_memory() -> int:
+    """ Available physical memory in bytes, or 0 if it can't be read.
+        MemAvailable of /proc/meminfo counts the page cache that can be reclaimed,
+        free pages of sysconf are only used where it doesn't exist.
+
+    Returns:
+        Available memory in bytes
+    """
+    try:
+        with open('/proc/meminfo') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+def dp_memory(item_count, capacity):
+    """ Memory in bytes of Dynamic Programming in table mode and in linear mode.
+
+    Args:
+        item_count (int): Number of items
+        capacity (int): The capacity of knapsack
+
+    Returns:
+        table_bytes (int): Bytes of bit-packed table and its rows
+        linear_bytes (int): Bytes of divide and conquer rows
+    """
+    table_bytes = item_count * ((capacity + 8) // 8) + DP_ROW_BYTES * (capacity + 1)
+    linear_bytes = LINEAR_DP_ROW_BYTES * (capacity + 1)
+    return table_bytes, linear_bytes
+
+def subset_sum_memory(item_count, capacity) -> int:
+    """ Memory in bytes of subset-sum bitset engine, about sqrt(n) checkpoints and a block
+        of sets rebuilt in the trace, each one with capacity + 1 bits.
+
+    Args:
+        item_count (int): Number of items
+        capacity (int): The capacity of knapsack
+
+    Returns:
+        Bytes of reachable sets
+    """
+    return (2 * ceil(sqrt(item_count)) + 1) * (capacity + 1) // 8
+
+def linear_bound(capacity, items) -> float:
+    """ Linear programming relaxation of knapsack, greedy fractional fill by density.
+
+    Args:
+        capacity (int): The capacity of knapsack
+        items (list[Item]): List of items to choose
+
+    Returns:
+        Optimistic estimate of value
+    """
+    room = capacity
+    bound = 0
+    for item in sorted(items, key=attrgetter('density'), reverse=True):
+        if item.weight > room:
+            return bound + room * item.density
+        room -= item.weight
+        bound += item.value
+    return bound
+
+def select_algorithm(input_data):
+    """ Select the algorithm to solve a knapsack instance based on a cost model.
+        Subset-sum instances are solved by the bitset engine if its checkpoints fit in memory.
+        The Dynamic Programming cost is the size of table (items x capacity), bit-packed
+        in memory or in linear memory if only the linear mode fits (it needs more bytes by
+        capacity, so it is smaller only with many items). If the table is too big, the
+        core problem is tried, then the Pareto frontier if there are few items (huge capacity),
+        then Branch and Bound if the gap between linear bound and greedy is tight, so the
+        tree is expected to close fast. With a loose gap CP-SAT is used if the model is not
+        too big, or a heuristic otherwise.
+
+    Args:
+        input_data (str): The data of knapsack instance
+
+    Returns:
+        algorithm (str): One of 'dp', 'linear_dp', 'core', 'pareto', 'cp_sat', 'bnb' and 'heuristic'
+        reason (str): Why the algorithm was selected
+    """
+    item_count, capacity, items = parser_input(input_data)
+    # Size of table after the reduction done by Dynamic Programming
+    reduced_capacity, reduced_items, _ = reduce_capacity(capacity, items)
+    cells = len(reduced_items) * (reduced_capacity + 1)
+    table_bytes, linear_bytes = dp_memory(len(reduced_items), reduced_capacity)
+    memory_limit = MEMORY_FRACTION * available_memory()
+
+    # Subset-sum is a shift-or by item, one machine word by 64 capacities
+    subset_sum_instance = is_subset_sum(items)
+    bitset_bytes = subset_sum_memory(len(reduced_items), reduced_capacity)
+    if subset_sum_instance and cells // 64 <= DP_CELL_LIMIT:
+        if not memory_limit or bitset_bytes <= memory_limit:
+            return 'dp', f'subset-sum instance, bitset of {cells} bits needs {bitset_bytes} bytes'
+    if cells <= DP_CELL_LIMIT:
+        # Dynamic Programming solves subset-sum by the bitset engine, never by the table
+        if not subset_sum_instance and (not memory_limit or table_bytes <= memory_limit):
+            return 'dp', f'table of {cells} cells needs {table_bytes} bytes'
+        if linear_bytes <= memory_limit:
+            return 'linear_dp', (
+                f'table of {cells} cells needs {table_bytes} bytes, linear mode needs '
+                f'{linear_bytes} bytes and {MEMORY_FRACTION:.0%} of available memory is {memory_limit:.0f}'
+            )
+
+    lower_bound, _, fixed, core = reduce_core(capacity, items)
+    core_capacity, core, _ = reduce_capacity(capacity - sum(item.weight for item in fixed), core)
+    core_cells = len(core) * (core_capacity + 1)
+    # Core is solved in linear mode
+    _, core_bytes = dp_memory(len(core), core_capacity)
+    if core_cells <= DP_CELL_LIMIT and (not memory_limit or core_bytes <= memory_limit):
+        return 'core', (
+            f'table of {cells} cells is too big, core has {len(core)} of {item_count} items '
+            f'and {core_cells} cells'
+        )
+
+    # Linear bound prunes nothing in subset-sum, all densities are equal
+    if item_count <= PARETO_ITEM_LIMIT and not subset_sum_instance:
+        return 'pareto', (
+            f'table of {cells} cells is too big and core has {core_cells} cells, '
+            f'but only {item_count} items'
+        )
+
+    upper_bound = linear_bound(capacity, items)
+    gap = (upper_bound - lower_bound) / upper_bound if upper_bound else 0
+    if gap <= BNB_GAP_LIMIT:
+        return 'bnb', (
+            f'table of {cells} cells is too big, core has {core_cells} cells '
+            f'and bound gap {gap:.4%} is tight'
+        )
+    if item_count <= CP_SAT_ITEM_LIMIT:
+        return 'cp_sat', (
+            f'table of {cells} cells is too big, core has {core_cells} cells '
+            f'and bound gap {gap:.4%} is loose'
+        )
+    return 'heuristic', (
+        f'bound gap {gap:.4%} is loose and {item_count} items are too many for CP-SAT'
+    )
@@ -1,3 +1,4 @@
+import numpy as np
 from collections import namedtuple
 Item = namedtuple("Item", ['index', 'value', 'weight', 'density'])
 
@@ -25,6 +26,23 @@ def parser_input(input_data):
     
     return item_count, capacity, items
 
+def parser_input_arrays(input_data):
+    """Parser a str input to NumPy arrays, without creating an Item for each item
+    
+    Args:
+        input_data (str): The data of knapsack instance
+    
+    Returns:
+        item_count (int): Number of items
+        capacity (int): Capacity of knapsack
+        values (np.ndarray): Value of each item
+        weights (np.ndarray): Weight of each item
+    """
+    tokens = input_data.split()
+    item_count, capacity = int(tokens[0]), int(tokens[1])
+    data = np.array(tokens[2:2 + 2 * item_count], dtype=np.int64).reshape(item_count, 2)
+    return item_count, capacity, data[:, 0], data[:, 1]
+
 def parser_output(value, taken, optimal=0):
     """Parser objetive value and decisions variables to specific format to submit assignment to Coursera
 